@@ -4,7 +4,6 @@ Async broker pattern (API → Queue → Worker)
 With ML Integration, Preemption, Generalist Routing, ETA Timers
 """
 
-import uuid
 import time
 from fastapi import FastAPI, status, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -17,9 +16,14 @@ from broker.async_broker import async_broker
 
 # ML Models
 from ml.classifier import TicketClassifier
+from ml.embeddings import deduplicator
 from routing.circuit_breaker import transformer_circuit, CircuitState
 from routing.skill_routing import agent_registry, TicketRequest, TicketStatus
 
+# In-memory priority queue for tickets awaiting an agent
+from ticket_queue import make_ticket_id, ticket_queue
+from ticket_queue.priority_queue import Ticket as QueuedTicket
+
 from config import settings
 
 # Connect broker safely
@@ -50,41 +54,33 @@ classifier = TicketClassifier()
 def _register_default_agents():
     """Register sample agents for skill-based routing on startup"""
     print("  Initializing agent registry...")
-    
-    # Define your agents here
-    sample_agents = [
-        {"name": "Alice", "skills": {"billing": 0.9, "technical": 0.3, "legal": 0.1}, "capacity": 3},
-        {"name": "Bob", "skills": {"technical": 0.95, "billing": 0.2, "legal": 0.1}, "capacity": 3},
-        {"name": "Charlie", "skills": {"legal": 0.9, "billing": 0.3, "technical": 0.1}, "capacity": 3},
-        {"name": "Diana", "skills": {"technical": 0.6, "billing": 0.6, "legal": 0.6}, "capacity": 3},  # Generalist
-    ]
 
-    # TO ADD NEW AGENTS MANUALLY:
-    # 1. Add them to the list above, OR
-    # 2. Uncomment and use the template below:
-    # 
-    # sample_agents.append({
-    #     "name": "YOUR_NAME", 
-    #     "skills": {"billing": 0.5, "technical": 0.5, "legal": 0.5}, 
-    #     "capacity": 5
-    # })
-
-    for agent in sample_agents:
-        agent_id = agent_registry.register_agent(
-            name=agent["name"],
-            skills=agent["skills"],
-            capacity=agent["capacity"]
-        )
+    # Define your agents here: (name, skills, capacity) per row.
+    # TO ADD NEW AGENTS MANUALLY, append a tuple like:
+    #     ("YOUR_NAME", {"billing": 0.5, "technical": 0.5, "legal": 0.5}, 5),
+    sample_agents = (
+        ("Alice", {"billing": 0.9, "technical": 0.3, "legal": 0.1}, 3),
+        ("Bob", {"technical": 0.95, "billing": 0.2, "legal": 0.1}, 3),
+        ("Charlie", {"legal": 0.9, "billing": 0.3, "technical": 0.1}, 3),
+        ("Diana", {"technical": 0.6, "billing": 0.6, "legal": 0.6}, 3),  # Generalist
+    )
+
+    agent_ids = agent_registry.register_many(sample_agents)
+    for (name, _, _), agent_id in zip(sample_agents, agent_ids):
         is_gen = "⭐ Generalist" if agent_registry.get_agent(agent_id).is_generalist() else ""
-        print(f"    - Registered: {agent['name']} ({agent_id[:8]}...) {is_gen}")
+        print(f"    - Registered: {name} ({agent_id[:8]}...) {is_gen}")
 
 _register_default_agents()
-print(f"  {len(agent_registry._agents)} agents ready.\n")
+print(f"  {agent_registry.agent_count()} agents ready.\n")
 
 
 # ================= TEMP STORE (for GET endpoints) =================
 tickets_store: Dict[str, dict] = {}
 
+# Interned per-category required-skills tuples: routing sees one shared
+# immutable tuple per category instead of a fresh list per ticket.
+_CATEGORY_SKILLS: Dict[str, tuple] = {}
+
 # ================= MODELS =================
 
 class TicketCreate(BaseModel):
@@ -102,6 +98,7 @@ class AcceptedResponse(BaseModel):
     eta_seconds: Optional[int] = None
     assigned_agent: Optional[str] = None
     preempted_ticket: Optional[str] = None
+    duplicate_of: Optional[str] = None
 
 
 class TicketResponse(BaseModel):
@@ -128,6 +125,15 @@ class PriorityUpdate(BaseModel):
     priority: float = Field(..., ge=0, le=1)
 
 
+class BulkTicketCreate(BaseModel):
+    tickets: List[TicketCreate] = Field(..., min_length=1, max_length=100)
+
+
+class BulkAcceptedResponse(BaseModel):
+    tickets: List[AcceptedResponse]
+    count: int
+
+
 # ML Classification Request/Response
 class MLClassifyRequest(BaseModel):
     text: str
@@ -174,7 +180,7 @@ class AgentStatsResponse(BaseModel):
 
 def _sync_ticket_store():
     """Sync tickets_store with agent ticket statuses and auto-complete expired ones"""
-    for agent in agent_registry._agents.values():
+    for agent in agent_registry.all_agents():
         # Check for expired tickets
         expired_ids = [tid for tid, t in agent.assigned_tickets.items() if t.is_expired()]
         for tid in expired_ids:
@@ -288,7 +294,7 @@ async def list_agents():
     """Get all agents with their assigned tickets"""
     _sync_ticket_store()
     agents = []
-    for agent in agent_registry._agents.values():
+    for agent in agent_registry.all_agents():
         agents.append(AgentResponse(
             agent_id=agent.agent_id,
             name=agent.name,
@@ -342,13 +348,38 @@ async def register_agent(request: AgentRegisterRequest):
 async def create_ticket(ticket_data: TicketCreate):
     """Create ticket with ML classification, routing, and preemption"""
     _sync_ticket_store()
-    
-    ticket_id = f"TKT-{uuid.uuid4().hex[:8].upper()}"
-    
+
     # Run ML classification
     combined_text = f"{ticket_data.subject} {ticket_data.description}"
     category, urgency = classifier.classify(combined_text)
+    return _admit_classified_ticket(ticket_data, category, urgency)
+
+
+def _admit_classified_ticket(
+    ticket_data: TicketCreate,
+    category,
+    urgency: float,
+    parked: Optional[List[QueuedTicket]] = None,
+) -> AcceptedResponse:
+    """Route, store and publish one classified ticket (shared by the
+    single and bulk create endpoints). If `parked` is given, tickets
+    awaiting an agent are collected there for a bulk enqueue instead of
+    being queued one by one."""
+    ticket_id = make_ticket_id()
+
+    # Semantic dedup: flag (not reject) tickets that closely match one
+    # seen within the recent window — the original's ID travels in the
+    # response so agents can merge them.
+    is_duplicate, similar_to, _ = deduplicator.add_ticket(
+        ticket_id, f"{ticket_data.subject} {ticket_data.description}"
+    )
+    duplicate_of = similar_to if is_duplicate else None
+
     category_str = category.value if hasattr(category, 'value') else str(category)
+    cat_lower = category_str.lower()
+    required_skills = _CATEGORY_SKILLS.get(cat_lower)
+    if required_skills is None:
+        required_skills = _CATEGORY_SKILLS[cat_lower] = (cat_lower,)
 
     payload = {
         "ticket_id": ticket_id,
@@ -364,7 +395,7 @@ async def create_ticket(ticket_data: TicketCreate):
         category=category_str,
         urgency=urgency,
         description=ticket_data.description,
-        required_skills=[category_str.lower()]
+        required_skills=required_skills
     )
     assigned_agent_id, preempted_ticket_id = agent_registry.route_ticket_with_preemption(ticket_request)
     
@@ -381,6 +412,22 @@ async def create_ticket(ticket_data: TicketCreate):
         tickets_store[preempted_ticket_id]["ticket_status"] = "paused"
         tickets_store[preempted_ticket_id]["status"] = "paused"
 
+    # No agent available — park the ticket in the priority queue
+    if not assigned_agent_id:
+        queued = QueuedTicket(
+            ticket_id=ticket_id,
+            subject=ticket_data.subject,
+            description=ticket_data.description,
+            category=category_str,
+            urgency=urgency,
+            priority=urgency,
+            customer_id=ticket_data.customer_id,
+        )
+        if parked is not None:
+            parked.append(queued)
+        else:
+            ticket_queue.enqueue(queued)
+
     # publish to queue
     try:
         async_broker.publish_ticket(payload)
@@ -399,24 +446,60 @@ async def create_ticket(ticket_data: TicketCreate):
         "remaining_eta": eta_seconds,
         "ticket_status": "active" if assigned_agent_id else "queued",
         "preempted_ticket": preempted_ticket_id,
+        "duplicate_of": duplicate_of,
     }
 
     # Build response message
     agent_msg = f" Assigned to: {assigned_agent_name}" if assigned_agent_name else " (No agent available)"
     preempt_msg = f" | Preempted: {preempted_ticket_id}" if preempted_ticket_id else ""
-    
+    dup_msg = f" | Possible duplicate of: {duplicate_of}" if duplicate_of else ""
+
     return AcceptedResponse(
         ticket_id=ticket_id,
         status="accepted",
-        message=f"Ticket queued. Category: {category_str}, Urgency: {urgency:.2f}{agent_msg}{preempt_msg}",
+        message=f"Ticket queued. Category: {category_str}, Urgency: {urgency:.2f}{agent_msg}{preempt_msg}{dup_msg}",
         category=category_str,
         urgency=urgency,
         eta_seconds=eta_seconds,
         assigned_agent=assigned_agent_name,
         preempted_ticket=preempted_ticket_id,
+        duplicate_of=duplicate_of,
     )
 
 
+# ================= BULK CREATE =================
+
+# Submission batch size used by clients; workload-dependent sweet spot
+BATCH_SIZE = 8
+
+
+@app.post(
+    "/api/tickets/bulk",
+    response_model=BulkAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def create_tickets_bulk(bulk: BulkTicketCreate):
+    """
+    Create many tickets in one request: a single classifier pass over
+    the batch, then per-ticket routing. Saves an HTTP round trip and
+    parse per ticket compared to individual POSTs.
+    """
+    _sync_ticket_store()
+
+    texts = [f"{t.subject} {t.description}" for t in bulk.tickets]
+    classified = classifier.batch_classify(texts)
+
+    parked: List[QueuedTicket] = []
+    responses = [
+        _admit_classified_ticket(ticket_data, category, urgency, parked=parked)
+        for ticket_data, (category, urgency) in zip(bulk.tickets, classified)
+    ]
+    if parked:
+        # One lock acquisition + heapify for the whole batch
+        ticket_queue.enqueue_many(parked)
+    return BulkAcceptedResponse(tickets=responses, count=len(responses))
+
+
 # ================= LIST =================
 
 @app.get("/api/tickets", response_model=TicketListResponse)
@@ -479,6 +562,7 @@ async def get_stats():
     return {
         "total_tickets": total_tickets,
         "queued": queued,
+        "awaiting_agent": ticket_queue.size(),
         "completed": completed,
         "paused": paused,
         "categories": categories,
@@ -526,7 +610,7 @@ async def complete_ticket_endpoint(ticket_id: str):
     
     # Find the agent holding this ticket
     completed = False
-    for agent in agent_registry._agents.values():
+    for agent in agent_registry.all_agents():
         if ticket_id in agent.assigned_tickets:
             agent_registry.complete_ticket(agent.agent_id, ticket_id)
             completed = True
@@ -565,6 +649,8 @@ async def delete_ticket(ticket_id: str):
         raise HTTPException(404, "Ticket not found")
 
     tickets_store[ticket_id]["status"] = "cancelled"
+    # Drop it from the waiting queue if it never got an agent
+    ticket_queue.remove_ticket(ticket_id)
 
     return {"message": "ticket cancelled"}
 
@@ -580,9 +666,11 @@ async def circuit_breaker_stats():
     with cb._lock:
         # Calculate time until reset attempt
         time_until_reset = 0
-        if cb._state == CircuitState.OPEN and cb._last_failure_time:
-            elapsed = time.time() - cb._last_failure_time
-            time_until_reset = max(0, cb.config.timeout_seconds - elapsed)
+        seconds_since_failure = None
+        if cb._last_failure_ns is not None:
+            seconds_since_failure = (time.monotonic_ns() - cb._last_failure_ns) / 1e9
+            if cb._state == CircuitState.OPEN:
+                time_until_reset = max(0, cb.config.timeout_seconds - seconds_since_failure)
         
         # Calculate average latency
         avg_latency = 0
@@ -600,8 +688,10 @@ async def circuit_breaker_stats():
             "failure_threshold": cb.config.failure_threshold,
             "timeout_seconds": cb.config.timeout_seconds,
             "time_until_reset_seconds": round(time_until_reset, 1),
-            "last_failure_time": cb._last_failure_time,
-            "is_available": cb.is_available()
+            "seconds_since_last_failure": round(seconds_since_failure, 1) if seconds_since_failure is not None else None,
+            # Derive availability from the state read above: is_available()
+            # re-acquires cb._lock, which is no longer reentrant.
+            "is_available": cb._state != CircuitState.OPEN
         }
 
 
@@ -610,7 +700,7 @@ async def circuit_breaker_stats():
 @app.get("/api/agents/history")
 async def agent_routing_history(limit: int = 20):
     """Get agent routing/assignment history"""
-    history = agent_registry._assignment_history[-limit:]
+    history = agent_registry.get_assignment_history(limit)
     enriched_history = []
     for item in history:
         agent = agent_registry.get_agent(item.get("agent_id"))
@@ -620,7 +710,7 @@ async def agent_routing_history(limit: int = 20):
         })
     return {
         "history": enriched_history,
-        "total_assignments": len(agent_registry._assignment_history)
+        "total_assignments": agent_registry.get_stats()["total_assignments"]
     }
 
 
@@ -632,7 +722,7 @@ async def preemption_history(limit: int = 20):
     events = agent_registry.get_preemption_history(limit)
     return {
         "events": events,
-        "total_preemptions": len(agent_registry._preemption_history)
+        "total_preemptions": agent_registry.get_stats()["total_preemptions"]
     }
 
 
@@ -128,27 +128,50 @@ class AsyncBroker:
     def consume_ticket(self, timeout: int = 0) -> Optional[TicketMessage]:
         """
         Pop a ticket from the queue (blocking).
-        
+
         Args:
-            timeout: Timeout in seconds (0 = non-blocking)
-            
+            timeout: Timeout in seconds (0 = block indefinitely,
+                per Redis BRPOPLPUSH semantics)
+
         Returns:
             TicketMessage if available, None otherwise
         """
         if not self._connected:
             raise RuntimeError("Not connected to Redis")
-        
+
         # Atomic move from queue to processing set
         result = self._redis_client.brpoplpush(
             self.TICKET_QUEUE,
             self.PROCESSING_SET,
             timeout=timeout
         )
-        
+
         if result:
             data = json.loads(result)
             return TicketMessage(**data)
-        
+
+        return None
+
+    def consume_ticket_nowait(self) -> Optional[TicketMessage]:
+        """
+        Pop a ticket from the queue without blocking.
+
+        Returns:
+            TicketMessage if one was queued, None immediately otherwise
+        """
+        if not self._connected:
+            raise RuntimeError("Not connected to Redis")
+
+        # Atomic move from queue to processing set, non-blocking
+        result = self._redis_client.rpoplpush(
+            self.TICKET_QUEUE,
+            self.PROCESSING_SET
+        )
+
+        if result:
+            data = json.loads(result)
+            return TicketMessage(**data)
+
         return None
     
     # ============ LOCK/STATUS OPERATIONS ============
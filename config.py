@@ -32,6 +32,7 @@ class Settings(BaseModel):
     # Agent Routing Settings
     GENERALIST_THRESHOLD: float = 0.5       # min skill across all categories to be generalist
     PREEMPTION_URGENCY_THRESHOLD: float = 0.85  # urgency that triggers preemption
+    SKILL_INDEX_MIN_PROFICIENCY: float = 0.3    # min proficiency to appear in the skill index
     
     # Deduplication Settings
     SIMILARITY_THRESHOLD: float = 0.9
@@ -0,0 +1,28 @@
+"""
+Queue-backed logging for hot paths.
+
+Loggers built here enqueue records lock-free on the calling thread (or
+event loop) and a background listener thread performs the formatting
+and stream I/O, so a slow stdout flush never stalls processing.
+"""
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+def make_queue_logger(name: str, level: int = logging.INFO) -> logging.Logger:
+    """
+    Return a logger whose records are handled on a background thread.
+
+    Idempotent per name: a logger that already has handlers is returned
+    unchanged, so module reloads don't stack listeners.
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, logging.StreamHandler())
+        logger.addHandler(QueueHandler(log_queue))
+        logger.setLevel(level)
+        logger.propagate = False
+        listener.start()
+    return logger
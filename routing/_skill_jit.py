@@ -0,0 +1,75 @@
+"""
+Numeric kernels for the routing hot path.
+
+When Numba is installed the kernels are JIT-compiled to native loops that
+release the GIL-bound Python overhead of per-agent scoring; without it
+they run as plain NumPy-backed Python, so the module works either way.
+The kernels are written as explicit for-loops (no fancy indexing) so
+Numba can compile them directly.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op decorator stand-in when Numba is not installed"""
+        def decorate(func):
+            return func
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return decorate
+
+
+@njit(cache=True)
+def score_agents(skill, load, capacity, generalist_mask, urgency, generalist_threshold):
+    """
+    Compute suitability scores for all agents in one pass.
+
+    skill: per-agent skill match for this ticket (float32 array)
+    load/capacity: current load and capacity (int32 arrays)
+    generalist_mask: agents guaranteed the generalist floor (bool array)
+    """
+    n = skill.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    urgency_weight = 0.7 + 0.3 * urgency
+    load_weight = 1.0 - urgency_weight
+    for i in range(n):
+        s = float(skill[i])
+        if generalist_mask[i] and s < generalist_threshold:
+            s = generalist_threshold
+        load_factor = 1.0 - load[i] / capacity[i]
+        out[i] = s * urgency_weight + load_factor * load_weight
+    return out
+
+
+@njit(cache=True)
+def find_preempt_victim(urgencies, statuses, agent_of, new_urgency, active_code):
+    """
+    Find the lowest-urgency active ticket strictly below new_urgency.
+
+    Returns (agent_index, ticket_index), or (-1, -1) if no eligible victim.
+    """
+    best_idx = -1
+    best_urg = new_urgency
+    for i in range(urgencies.shape[0]):
+        if statuses[i] == active_code and urgencies[i] < best_urg:
+            best_urg = urgencies[i]
+            best_idx = i
+    if best_idx < 0:
+        return -1, -1
+    return agent_of[best_idx], best_idx
+
+
+if NUMBA_AVAILABLE:
+    # Warm up the JIT at import time so the first routed ticket doesn't
+    # pay compilation latency.
+    _skill = np.zeros(1, dtype=np.float32)
+    _ints = np.ones(1, dtype=np.int32)
+    _mask = np.zeros(1, dtype=np.bool_)
+    score_agents(_skill, _ints, _ints, _mask, 0.5, 0.5)
+    find_preempt_victim(_skill, np.zeros(1, dtype=np.uint8), _ints, 0.5, 0)
+    del _skill, _ints, _mask
@@ -4,10 +4,15 @@ Implements automatic failover between ML models based on latency
 """
 import time
 import threading
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Callable, Any, Optional
 from dataclasses import dataclass
 from config import settings
+from log_utils import make_queue_logger
+
+# Circuit state changes are often logged inside the breaker lock, so
+# they go through the shared queue-backed logger.
+logger = make_queue_logger(__name__)
 
 
 class CircuitState(Enum):
@@ -16,7 +21,37 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"  # Testing if service recovered
 
 
-@dataclass
+class CircuitEvent(IntEnum):
+    """Events that can drive a circuit state transition"""
+    SUCCESS = 0
+    FAILURE = 1          # failure below the count threshold
+    FAILURE_LIMIT = 2    # failure count reached the threshold
+    LATENCY_SPIKE = 3    # latency exceeded the threshold
+    TIMEOUT_EXPIRED = 4  # reset timeout elapsed while OPEN
+
+
+# (state, event) -> next state. A single table lookup replaces the nested
+# threshold/state conditionals that used to decide transitions.
+_TRANSITIONS = {
+    (CircuitState.CLOSED, CircuitEvent.SUCCESS): CircuitState.CLOSED,
+    (CircuitState.CLOSED, CircuitEvent.FAILURE): CircuitState.CLOSED,
+    (CircuitState.CLOSED, CircuitEvent.FAILURE_LIMIT): CircuitState.OPEN,
+    (CircuitState.CLOSED, CircuitEvent.LATENCY_SPIKE): CircuitState.OPEN,
+    (CircuitState.CLOSED, CircuitEvent.TIMEOUT_EXPIRED): CircuitState.CLOSED,
+    (CircuitState.OPEN, CircuitEvent.SUCCESS): CircuitState.OPEN,
+    (CircuitState.OPEN, CircuitEvent.FAILURE): CircuitState.OPEN,
+    (CircuitState.OPEN, CircuitEvent.FAILURE_LIMIT): CircuitState.OPEN,
+    (CircuitState.OPEN, CircuitEvent.LATENCY_SPIKE): CircuitState.OPEN,
+    (CircuitState.OPEN, CircuitEvent.TIMEOUT_EXPIRED): CircuitState.HALF_OPEN,
+    (CircuitState.HALF_OPEN, CircuitEvent.SUCCESS): CircuitState.HALF_OPEN,
+    (CircuitState.HALF_OPEN, CircuitEvent.FAILURE): CircuitState.HALF_OPEN,
+    (CircuitState.HALF_OPEN, CircuitEvent.FAILURE_LIMIT): CircuitState.OPEN,
+    (CircuitState.HALF_OPEN, CircuitEvent.LATENCY_SPIKE): CircuitState.OPEN,
+    (CircuitState.HALF_OPEN, CircuitEvent.TIMEOUT_EXPIRED): CircuitState.HALF_OPEN,
+}
+
+
+@dataclass(slots=True)
 class CircuitBreakerConfig:
     """Configuration for circuit breaker"""
     failure_threshold: int = 5
@@ -42,8 +77,10 @@ class CircuitBreaker:
         self._state = CircuitState.CLOSED
         self._failure_count = 0
         self._success_count = 0
-        self._last_failure_time: Optional[float] = None
-        self._lock = threading.RLock()
+        self._last_failure_ns: Optional[int] = None
+        # Plain Lock: no code path re-enters the lock (the *_locked internals
+        # never acquire it), and Lock skips RLock's owner bookkeeping.
+        self._lock = threading.Lock()
         
         # Latency tracking
         self._latency_history: list = []
@@ -56,50 +93,70 @@ class CircuitBreaker:
             # Check if we should transition from OPEN to HALF_OPEN
             if self._state == CircuitState.OPEN:
                 if self._should_attempt_reset():
-                    self._state = CircuitState.HALF_OPEN
-            
+                    self._apply_event(CircuitEvent.TIMEOUT_EXPIRED)
+
             return self._state
+
+    def _apply_event(self, event: CircuitEvent) -> None:
+        """Apply one event to the state machine (caller holds the lock)"""
+        new_state = _TRANSITIONS[self._state, event]
+        if new_state is not self._state:
+            self._state = new_state
+            if new_state is CircuitState.OPEN:
+                logger.info("Circuit '%s' OPEN - too many failures or high latency", self.name)
     
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset"""
-        if self._last_failure_time is None:
+        if self._last_failure_ns is None:
             return True
-        
-        return (time.time() - self._last_failure_time) >= self.config.timeout_seconds
+
+        # Monotonic nanoseconds: immune to NTP/wall-clock jumps that could
+        # otherwise pin the circuit OPEN or reset it early.
+        elapsed_ns = time.monotonic_ns() - self._last_failure_ns
+        return elapsed_ns >= self.config.timeout_seconds * 1e9
     
     def record_success(self) -> None:
         """Record a successful call"""
         with self._lock:
-            if self._state == CircuitState.HALF_OPEN:
-                self._success_count += 1
-                if self._success_count >= self.config.success_threshold:
-                    self._state = CircuitState.CLOSED
-                    self._failure_count = 0
-                    self._success_count = 0
-                    print(f"Circuit '{self.name}' CLOSED - recovered")
-            else:
+            self._record_success_locked()
+
+    def _record_success_locked(self) -> None:
+        if self._state == CircuitState.HALF_OPEN:
+            self._success_count += 1
+            if self._success_count >= self.config.success_threshold:
+                self._state = CircuitState.CLOSED
                 self._failure_count = 0
+                self._success_count = 0
+                logger.info("Circuit '%s' CLOSED - recovered", self.name)
+        else:
+            self._failure_count = 0
     
     def record_failure(self, latency_ms: float = None) -> None:
         """Record a failed call"""
         with self._lock:
-            self._failure_count += 1
-            self._last_failure_time = time.time()
-            
-            # Check if latency exceeded threshold
-            if latency_ms and latency_ms > self.config.latency_threshold_ms:
-                print(f"Circuit '{self.name}' latency {latency_ms}ms exceeded threshold {self.config.latency_threshold_ms}ms")
-                self._trigger_open()
-            
-            # Check if failure count exceeded threshold
-            if self._failure_count >= self.config.failure_threshold:
-                self._trigger_open()
+            self._record_failure_locked(latency_ms)
+
+    def _record_failure_locked(self, latency_ms: float = None) -> None:
+        self._failure_count += 1
+        self._last_failure_ns = time.monotonic_ns()
+
+        if latency_ms and latency_ms > self.config.latency_threshold_ms:
+            logger.info(
+                "Circuit '%s' latency %sms exceeded threshold %sms",
+                self.name, latency_ms, self.config.latency_threshold_ms,
+            )
+            event = CircuitEvent.LATENCY_SPIKE
+        elif self._failure_count >= self.config.failure_threshold:
+            event = CircuitEvent.FAILURE_LIMIT
+        else:
+            event = CircuitEvent.FAILURE
+        self._apply_event(event)
     
     def _trigger_open(self) -> None:
         """Trigger circuit to open"""
         if self._state != CircuitState.OPEN:
             self._state = CircuitState.OPEN
-            print(f"Circuit '{self.name}' OPEN - too many failures or high latency")
+            logger.info("Circuit '%s' OPEN - too many failures or high latency", self.name)
     
     def record_latency(self, latency_ms: float) -> None:
         """
@@ -109,15 +166,37 @@ class CircuitBreaker:
             latency_ms: Latency in milliseconds
         """
         with self._lock:
-            self._latency_history.append(latency_ms)
-            if len(self._latency_history) > self._max_latency_history:
-                self._latency_history.pop(0)
-            
-            # Check average latency
-            if len(self._latency_history) >= 10:
-                avg_latency = sum(self._latency_history) / len(self._latency_history)
-                if avg_latency > self.config.latency_threshold_ms:
-                    self.record_failure(latency_ms=avg_latency)
+            self._record_latency_locked(latency_ms)
+
+    def _record_latency_locked(self, latency_ms: float) -> None:
+        self._latency_history.append(latency_ms)
+        if len(self._latency_history) > self._max_latency_history:
+            self._latency_history.pop(0)
+
+        # Check average latency
+        if len(self._latency_history) >= 10:
+            avg_latency = sum(self._latency_history) / len(self._latency_history)
+            if avg_latency > self.config.latency_threshold_ms:
+                self._record_failure_locked(latency_ms=avg_latency)
+
+    def _try_acquire(self) -> bool:
+        """
+        Check availability and perform the OPEN -> HALF_OPEN timeout
+        transition in a single lock acquisition.
+        """
+        with self._lock:
+            if self._state == CircuitState.OPEN and self._should_attempt_reset():
+                self._apply_event(CircuitEvent.TIMEOUT_EXPIRED)
+            return self._state != CircuitState.OPEN
+
+    def _commit(self, success: bool, latency_ms: float) -> None:
+        """Record a call's outcome and latency in a single lock acquisition."""
+        with self._lock:
+            if success:
+                self._record_latency_locked(latency_ms)
+                self._record_success_locked()
+            else:
+                self._record_failure_locked(latency_ms)
     
     def is_available(self) -> bool:
         """Check if circuit allows requests"""
@@ -138,20 +217,17 @@ class CircuitBreaker:
         Raises:
             RuntimeError: If circuit is open
         """
-        if not self.is_available():
+        if not self._try_acquire():
             raise RuntimeError(f"Circuit '{self.name}' is OPEN")
-        
-        start_time = time.time()
+
+        start_ns = time.monotonic_ns()
         try:
             result = func(*args, **kwargs)
-            latency_ms = (time.time() - start_time) * 1000
-            self.record_latency(latency_ms)
-            self.record_success()
-            return result
         except Exception as e:
-            latency_ms = (time.time() - start_time) * 1000
-            self.record_failure(latency_ms)
+            self._commit(False, (time.monotonic_ns() - start_ns) / 1_000_000)
             raise e
+        self._commit(True, (time.monotonic_ns() - start_ns) / 1_000_000)
+        return result
     
     async def execute_async(self, func: Callable, *args, **kwargs) -> Any:
         """
@@ -168,20 +244,17 @@ class CircuitBreaker:
         Raises:
             RuntimeError: If circuit is open
         """
-        if not self.is_available():
+        if not self._try_acquire():
             raise RuntimeError(f"Circuit '{self.name}' is OPEN")
-        
-        start_time = time.time()
+
+        start_ns = time.monotonic_ns()
         try:
             result = await func(*args, **kwargs)
-            latency_ms = (time.time() - start_time) * 1000
-            self.record_latency(latency_ms)
-            self.record_success()
-            return result
         except Exception as e:
-            latency_ms = (time.time() - start_time) * 1000
-            self.record_failure(latency_ms)
+            self._commit(False, (time.monotonic_ns() - start_ns) / 1_000_000)
             raise e
+        self._commit(True, (time.monotonic_ns() - start_ns) / 1_000_000)
+        return result
     
     def reset(self) -> None:
         """Manually reset the circuit breaker"""
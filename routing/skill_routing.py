@@ -8,16 +8,26 @@ Enhanced with:
 - Generalist routing: agents with >=50% in all skills can handle any ticket
 - ETA computation for ticket completion
 """
+import functools
+import heapq
+import itertools
+import operator
 import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
-import uuid
+from enum import Enum, IntEnum
 import numpy as np
 
 from config import settings
+from log_utils import make_queue_logger
+from routing._skill_jit import score_agents, find_preempt_victim
+
+# Preemption events fire on the routing hot path, so they go through
+# the shared queue-backed logger.
+logger = make_queue_logger(__name__)
 
 
 class AgentStatus(Enum):
@@ -32,7 +42,43 @@ class TicketStatus(str, Enum):
     COMPLETED = "completed"
 
 
-@dataclass
+class SkillCategory(IntEnum):
+    """Known skill categories; values index the per-agent skill vectors."""
+    BILLING = 0
+    TECHNICAL = 1
+    LEGAL = 2
+
+
+# Category names in vector/matrix column order.
+SKILL_CATEGORIES = ("billing", "technical", "legal")
+_CATEGORY_INDEX = {name: idx for idx, name in enumerate(SKILL_CATEGORIES)}
+
+# Per-ticket status codes used by the agents' SoA ticket arrays.
+_TICKET_ACTIVE = np.uint8(0)
+_TICKET_PAUSED = np.uint8(1)
+
+# Hoisted sentinels: building inf/-inf inline allocates a float per call
+# inside the routing loops.
+_POS_INF = float("inf")
+_NEG_INF = float("-inf")
+
+
+def registry_expired_mask(
+    status: np.ndarray,
+    start: np.ndarray,
+    eta: np.ndarray,
+    elapsed: np.ndarray,
+    now: float,
+) -> np.ndarray:
+    """
+    Branchless expiry check over SoA ticket arrays: a single vector
+    expression with one hoisted `now` instead of per-ticket status
+    branches and time.time() calls.
+    """
+    return (status == _TICKET_ACTIVE) & ((now - start) + elapsed >= eta)
+
+
+@dataclass(slots=True)
 class AssignedTicket:
     """A ticket assigned to an agent with tracking info"""
     ticket_id: str
@@ -60,36 +106,140 @@ class AssignedTicket:
         return self.status == TicketStatus.ACTIVE and self.remaining_eta() <= 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Agent:
     """Agent with skill vector and capacity"""
     agent_id: str
     name: str
-    skills: Dict[str, float]  # Skill name -> proficiency (0-1)
+    skills: Dict[str, float]  # Skill name -> proficiency (0-1); API view
     capacity: int = 5  # Max concurrent tickets
     current_load: int = 0
     status: AgentStatus = AgentStatus.AVAILABLE
-    created_at: datetime = field(default_factory=datetime.now)
+    # Epoch float: a datetime allocation per registration is overhead
+    # the registry never reads; the created_at property formats lazily.
+    created_ts: float = field(default_factory=time.time)
     assigned_tickets: Dict[str, AssignedTicket] = field(default_factory=dict)
-    
+    # Agent-local lock: load/ticket mutations synchronize here instead of
+    # on a registry-wide lock, so accepts on different agents never contend.
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    # Enum-indexed mirror of skills: proficiency per SkillCategory plus
+    # a was-it-provided mask, so scoring does one array index instead of
+    # a str.lower() allocation and a dict hash per call. The skills dict
+    # stays as the API-facing view.
+    skills_vec: np.ndarray = field(init=False, repr=False)
+    skills_known: np.ndarray = field(init=False, repr=False)
+    # Skills only change at registration, so the generalist check is
+    # computed once instead of per score evaluation.
+    _is_generalist: bool = field(init=False, repr=False)
+    # SoA mirror of the hot per-ticket fields, rows aligned with _tids:
+    # scans (preemption victim, paused counts) run over contiguous
+    # arrays instead of chasing ticket objects. The AssignedTicket dict
+    # keeps the descriptive fields. Released rows are swap-popped so the
+    # arrays stay dense.
+    _tids: List[str] = field(default_factory=list, init=False, repr=False)
+    _tid_index: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _urg: np.ndarray = field(init=False, repr=False)
+    _ticket_status: np.ndarray = field(init=False, repr=False)
+    _start: np.ndarray = field(init=False, repr=False)
+    _eta: np.ndarray = field(init=False, repr=False)
+    _elapsed: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        vec = np.zeros(len(SkillCategory), dtype=np.float32)
+        known = np.zeros(len(SkillCategory), dtype=bool)
+        for skill, proficiency in self.skills.items():
+            idx = _CATEGORY_INDEX.get(skill.lower())
+            if idx is not None:
+                vec[idx] = proficiency
+                known[idx] = True
+        self.skills_vec = vec
+        self.skills_known = known
+        self._is_generalist = bool((vec >= settings.GENERALIST_THRESHOLD).all())
+        self._urg = np.empty(0, dtype=np.float32)
+        self._ticket_status = np.empty(0, dtype=np.uint8)
+        self._start = np.empty(0, dtype=np.float64)
+        self._eta = np.empty(0, dtype=np.float64)
+        self._elapsed = np.empty(0, dtype=np.float64)
+
+    def _track_ticket(self, ticket: 'AssignedTicket') -> None:
+        """Append a ticket's hot fields to the SoA arrays."""
+        self._tid_index[ticket.ticket_id] = len(self._tids)
+        self._tids.append(ticket.ticket_id)
+        self._urg = np.append(self._urg, np.float32(ticket.urgency))
+        self._ticket_status = np.append(self._ticket_status, _TICKET_ACTIVE)
+        self._start = np.append(self._start, ticket.started_at)
+        self._eta = np.append(self._eta, float(ticket.eta_seconds))
+        self._elapsed = np.append(self._elapsed, ticket.elapsed_before_pause)
+
+    def _untrack_ticket(self, ticket_id: str) -> None:
+        """Swap-pop a ticket's row so the arrays stay contiguous."""
+        idx = self._tid_index.pop(ticket_id, None)
+        if idx is None:
+            return
+        last = len(self._tids) - 1
+        if idx != last:
+            moved = self._tids[last]
+            self._tids[idx] = moved
+            self._urg[idx] = self._urg[last]
+            self._ticket_status[idx] = self._ticket_status[last]
+            self._start[idx] = self._start[last]
+            self._eta[idx] = self._eta[last]
+            self._elapsed[idx] = self._elapsed[last]
+            self._tid_index[moved] = idx
+        self._tids.pop()
+        self._urg = self._urg[:last]
+        self._ticket_status = self._ticket_status[:last]
+        self._start = self._start[:last]
+        self._eta = self._eta[:last]
+        self._elapsed = self._elapsed[:last]
+
+    def expired_ticket_ids(self, now: float) -> List[str]:
+        """IDs of active tickets whose ETA has elapsed, in one vector op."""
+        if not self._tids:
+            return []
+        mask = registry_expired_mask(
+            self._ticket_status, self._start, self._eta, self._elapsed, now
+        )
+        return [self._tids[i] for i in np.flatnonzero(mask)]
+
+    def _set_ticket_status_code(self, ticket_id: str, code: np.uint8) -> None:
+        idx = self._tid_index.get(ticket_id)
+        if idx is not None:
+            self._ticket_status[idx] = code
+
+    @property
+    def created_at(self) -> datetime:
+        """Registration time as a datetime, built on demand"""
+        return datetime.fromtimestamp(self.created_ts)
+
     def can_accept_ticket(self) -> bool:
         """Check if agent can accept more tickets"""
         return self.status == AgentStatus.AVAILABLE and self.current_load < self.capacity
-    
+
     def accept_ticket(self, ticket: 'AssignedTicket') -> bool:
         """Accept a ticket, returns True if successful"""
+        with self._lock:
+            return self._accept_locked(ticket)
+
+    def _accept_locked(self, ticket: 'AssignedTicket') -> bool:
         if self.can_accept_ticket():
             self.current_load += 1
             self.assigned_tickets[ticket.ticket_id] = ticket
+            self._track_ticket(ticket)
             return True
         return False
-    
+
     def release_ticket(self, ticket_id: str = None) -> bool:
         """Release a ticket, returns True if successful"""
+        with self._lock:
+            return self._release_locked(ticket_id)
+
+    def _release_locked(self, ticket_id: str = None) -> bool:
         if ticket_id and ticket_id in self.assigned_tickets:
             t = self.assigned_tickets[ticket_id]
             t.status = TicketStatus.COMPLETED
             del self.assigned_tickets[ticket_id]
+            self._untrack_ticket(ticket_id)
             if self.current_load > 0:
                 self.current_load -= 1
             return True
@@ -100,117 +250,441 @@ class Agent:
 
     def pause_ticket(self, ticket_id: str) -> bool:
         """Pause an active ticket on this agent"""
+        with self._lock:
+            return self._pause_locked(ticket_id)
+
+    def _pause_locked(self, ticket_id: str) -> bool:
         if ticket_id in self.assigned_tickets:
             t = self.assigned_tickets[ticket_id]
             if t.status == TicketStatus.ACTIVE:
                 t.elapsed_before_pause += (time.time() - t.started_at)
                 t.paused_at = time.time()
                 t.status = TicketStatus.PAUSED
+                self._set_ticket_status_code(ticket_id, _TICKET_PAUSED)
+                idx = self._tid_index.get(ticket_id)
+                if idx is not None:
+                    self._elapsed[idx] = t.elapsed_before_pause
                 return True
         return False
 
     def resume_ticket(self, ticket_id: str) -> bool:
         """Resume a paused ticket on this agent"""
+        with self._lock:
+            return self._resume_locked(ticket_id)
+
+    def _resume_locked(self, ticket_id: str) -> bool:
         if ticket_id in self.assigned_tickets:
             t = self.assigned_tickets[ticket_id]
             if t.status == TicketStatus.PAUSED:
                 t.started_at = time.time()
                 t.paused_at = None
                 t.status = TicketStatus.ACTIVE
+                self._set_ticket_status_code(ticket_id, _TICKET_ACTIVE)
+                idx = self._tid_index.get(ticket_id)
+                if idx is not None:
+                    self._start[idx] = t.started_at
                 return True
         return False
 
     def get_lowest_urgency_active_ticket(self) -> Optional[AssignedTicket]:
         """Get the active ticket with the lowest urgency on this agent"""
-        active = [t for t in self.assigned_tickets.values() if t.status == TicketStatus.ACTIVE]
-        if not active:
+        if not self._tids:
+            return None
+        masked = np.where(self._ticket_status == _TICKET_ACTIVE, self._urg, _POS_INF)
+        idx = int(np.argmin(masked))
+        if masked[idx] == _POS_INF:
             return None
-        return min(active, key=lambda t: t.urgency)
+        return self.assigned_tickets.get(self._tids[idx])
 
     def is_generalist(self) -> bool:
         """Check if agent has >= GENERALIST_THRESHOLD in all skill categories"""
-        all_categories = ["billing", "technical", "legal"]
-        return all(
-            self.skills.get(cat, 0.0) >= settings.GENERALIST_THRESHOLD
-            for cat in all_categories
-        )
+        return self._is_generalist
 
     def get_assigned_tickets_info(self) -> List[dict]:
         """Get info about all assigned tickets"""
-        result = []
+        rows = []
         for t in self.assigned_tickets.values():
-            result.append({
-                "ticket_id": t.ticket_id,
-                "category": t.category,
-                "urgency": t.urgency,
-                "status": t.status.value,
-                "eta_seconds": t.eta_seconds,
-                "remaining_eta": round(t.remaining_eta(), 1),
-                "description": t.description[:80] + "..." if len(t.description) > 80 else t.description,
-            })
-        # Sort by urgency descending (most urgent first)
-        result.sort(key=lambda x: x["urgency"], reverse=True)
-        return result
-
-
-@dataclass
+            desc = t.description
+            if len(desc) > 80:
+                desc = desc[:80] + "..."
+            rows.append((
+                t.urgency,
+                t.ticket_id,
+                t.category,
+                t.status.value,
+                t.eta_seconds,
+                round(t.remaining_eta(), 1),
+                desc,
+            ))
+        # Sort by urgency descending (most urgent first); tuple rows and
+        # the C-implemented itemgetter keep the sort out of Python code.
+        rows.sort(key=operator.itemgetter(0), reverse=True)
+        return [
+            {
+                "ticket_id": ticket_id,
+                "category": category,
+                "urgency": urgency,
+                "status": status,
+                "eta_seconds": eta_seconds,
+                "remaining_eta": remaining_eta,
+                "description": desc,
+            }
+            for urgency, ticket_id, category, status, eta_seconds, remaining_eta, desc in rows
+        ]
+
+
+@dataclass(slots=True)
 class TicketRequest:
     """Ticket request for routing"""
     ticket_id: str
     category: str
     urgency: float  # 0-1
     description: str
-    required_skills: List[str] = field(default_factory=list)
+    # Sequence rather than List so callers can pass shared immutable
+    # tuples (e.g. a cached per-category tuple) without a copy.
+    required_skills: Sequence[str] = ()
+
+
+def _wrap_scorer(skill_match):
+    """
+    Close a skill-match function into the full scoring expression.
+
+    Score = skill_match * urgency_weight + load_factor * load_weight,
+    where generalist agents (>= GENERALIST_THRESHOLD in all skills) are
+    guaranteed at least the threshold as their skill match.
+    """
+    generalist_threshold = settings.GENERALIST_THRESHOLD
+
+    def scorer(agent: Agent, urgency_weight: float, load_weight: float) -> float:
+        skill_score = skill_match(agent)
+        if skill_score < generalist_threshold and agent.is_generalist():
+            skill_score = generalist_threshold
+        load_factor = 1.0 - (agent.current_load / agent.capacity)
+        return (skill_score * urgency_weight) + (load_factor * load_weight)
+
+    return scorer
+
+
+@functools.lru_cache(maxsize=64)
+def _score_by_category(category_lower: str):
+    """
+    Scorer for the common no-required-skills case: one array index per
+    agent. Categories repeat heavily so the closures are cached.
+    """
+    cat_idx = _CATEGORY_INDEX.get(category_lower)
+
+    if cat_idx is None:
+        def skill_match(agent: Agent) -> float:
+            return 0.5
+    else:
+        def skill_match(agent: Agent) -> float:
+            if agent.skills_known[cat_idx]:
+                return float(agent.skills_vec[cat_idx])
+            return 0.5
+
+    return _wrap_scorer(skill_match)
+
+
+@functools.lru_cache(maxsize=256)
+def _score_by_required(required_skills: Tuple[str, ...]):
+    """
+    Scorer for tickets that pin explicit required skills: averages the
+    named proficiencies. Unknown skill names contribute 0.0, same as
+    the old dict.get.
+    """
+    inv_count = 1.0 / len(required_skills)
+    known_indices = tuple(
+        idx for idx in (_CATEGORY_INDEX.get(s.lower()) for s in required_skills)
+        if idx is not None
+    )
+
+    def skill_match(agent: Agent) -> float:
+        total = 0.0
+        for idx in known_indices:
+            total += float(agent.skills_vec[idx])
+        return total * inv_count
+
+    return _wrap_scorer(skill_match)
 
 
 class AgentRegistry:
     """
     Stateful registry of agents with skill vectors.
     Implements skill-based routing with preemption and generalist support.
+
+    Locking is split three ways so concurrent routing scales with agents:
+    a lightweight registry lock guards only dict membership, each Agent's
+    own lock guards its load/ticket state, and histories plus the skill
+    index have a lock of their own. Routing snapshots the agent list under
+    the dict lock and then touches only the locks of agents it mutates.
     """
-    
+
     def __init__(self):
         self._agents: Dict[str, Agent] = {}
-        self._lock = threading.RLock()
-        self._assignment_history: List[Dict] = []
-        self._preemption_history: List[Dict] = []
-    
+        # Agent IDs only need registry uniqueness: a counter avoids the
+        # os.urandom call and 36-char string uuid4 costs per registration.
+        self._next_id = itertools.count(1)
+        # Guards _agents membership only; per-agent state uses Agent._lock.
+        self._lock = threading.Lock()
+        self._history_lock = threading.Lock()
+        # Ring buffers: unbounded lists pin memory for the process
+        # lifetime under sustained routing. Monotonic counters keep the
+        # all-time totals for get_stats.
+        self._assignment_history: deque = deque(maxlen=10_000)
+        self._preemption_history: deque = deque(maxlen=1_000)
+        self._total_assignments = 0
+        self._total_preemptions = 0
+        # Inverted index: skill name -> ids of agents proficient in it.
+        # Lets route_ticket scan only agents that can plausibly match
+        # instead of the whole registry.
+        self._skill_to_agents: Dict[str, Set[str]] = {}
+        # Structure-of-arrays mirror of per-agent scalars, rows aligned
+        # with _agent_ids, so routing can score every agent in one
+        # vectorized expression instead of a Python loop.
+        self._array_lock = threading.Lock()
+        self._agent_ids: List[str] = []
+        self._agent_index: Dict[str, int] = {}
+        self._skill_matrix = np.empty((0, len(SKILL_CATEGORIES)), dtype=np.float32)
+        self._has_skill = np.empty((0, len(SKILL_CATEGORIES)), dtype=bool)
+        self._load_arr = np.empty(0, dtype=np.int32)
+        self._capacity_arr = np.empty(0, dtype=np.int32)
+        self._generalist_mask = np.empty(0, dtype=bool)
+        self._status_ok = np.empty(0, dtype=bool)
+        # Incrementally-maintained totals so get_stats is O(1) instead
+        # of a full registry scan (dashboards poll it). Updated next to
+        # the SoA rows under _array_lock; get_stats(verify=True)
+        # recomputes them the old way for parity checks.
+        self._total_capacity = 0
+        self._total_load = 0
+        self._available_count = 0
+        self._generalist_count = 0
+        self._active_per_agent = np.empty(0, dtype=np.int32)
+        self._paused_per_agent = np.empty(0, dtype=np.int32)
+        self._active_total = 0
+        self._paused_total = 0
+        # Min-heap of (absolute deadline, agent_id, ticket_id) with lazy
+        # deletion: expiry checks pop only entries whose deadline has
+        # passed instead of scanning every assigned ticket per route.
+        self._expiry_lock = threading.Lock()
+        self._expiry_heap: List[Tuple[float, str, str]] = []
+        self._invalidated: Set[Tuple[str, str]] = set()
+        # Min-heap of (urgency, version, agent_id, ticket_id) over all
+        # active tickets: the preemption victim is the root, so victim
+        # selection is O(log N) instead of a scan of every agent's
+        # tickets. Versions make pause/release invalidation lazy — an
+        # entry is live only if its version matches _ticket_versions.
+        self._preempt_lock = threading.Lock()
+        self._active_urg_heap: List[Tuple[float, int, str, str]] = []
+        self._ticket_versions: Dict[Tuple[str, str], int] = {}
+
+    def _heap_push_active(self, agent_id: str, ticket: AssignedTicket) -> None:
+        """Register a newly active ticket on the preemption heap."""
+        key = (agent_id, ticket.ticket_id)
+        with self._preempt_lock:
+            version = self._ticket_versions.get(key, 0) + 1
+            self._ticket_versions[key] = version
+            heapq.heappush(
+                self._active_urg_heap,
+                (ticket.urgency, version, agent_id, ticket.ticket_id),
+            )
+
+    def _heap_invalidate_active(self, agent_id: str, ticket_id: str) -> None:
+        """Invalidate a ticket's heap entry (paused or released)."""
+        key = (agent_id, ticket_id)
+        with self._preempt_lock:
+            if key in self._ticket_versions:
+                self._ticket_versions[key] += 1
+
+    def _schedule_expiry(self, agent_id: str, ticket: AssignedTicket) -> None:
+        """Queue a ticket's ETA deadline on the expiry heap."""
+        deadline = ticket.started_at + (ticket.eta_seconds - ticket.elapsed_before_pause)
+        with self._expiry_lock:
+            self._invalidated.discard((agent_id, ticket.ticket_id))
+            heapq.heappush(self._expiry_heap, (deadline, agent_id, ticket.ticket_id))
+
+    def _invalidate_expiry(self, agent_id: str, ticket_id: str) -> None:
+        """Mark a heap entry stale (ticket paused or released early)."""
+        with self._expiry_lock:
+            self._invalidated.add((agent_id, ticket_id))
+
+    def _snapshot_agents(self) -> List[Agent]:
+        """Snapshot the agent list, holding the dict lock only for the copy."""
+        with self._lock:
+            return list(self._agents.values())
+
+    def all_agents(self) -> List[Agent]:
+        """Snapshot of all registered agents."""
+        return self._snapshot_agents()
+
+    def agent_count(self) -> int:
+        """Number of registered agents."""
+        with self._lock:
+            return len(self._agents)
+
     def register_agent(
         self,
         name: str,
         skills: Dict[str, float],
         capacity: int = 5
     ) -> str:
-        agent_id = str(uuid.uuid4())
+        agent_id = f"A{next(self._next_id):012d}"
         agent = Agent(
             agent_id=agent_id,
             name=name,
             skills=skills,
             capacity=capacity
         )
-        
+
         with self._lock:
             self._agents[agent_id] = agent
-        
+        with self._history_lock:
+            for skill, proficiency in skills.items():
+                if proficiency >= settings.SKILL_INDEX_MIN_PROFICIENCY:
+                    self._skill_to_agents.setdefault(skill, set()).add(agent_id)
+
+        skill_row = agent.skills_vec
+        has_row = agent.skills_known
+        with self._array_lock:
+            self._agent_index[agent_id] = len(self._agent_ids)
+            self._agent_ids.append(agent_id)
+            self._skill_matrix = np.vstack([self._skill_matrix, skill_row])
+            self._has_skill = np.vstack([self._has_skill, has_row])
+            self._load_arr = np.append(self._load_arr, np.int32(0))
+            self._capacity_arr = np.append(self._capacity_arr, np.int32(capacity))
+            self._generalist_mask = np.append(self._generalist_mask, agent.is_generalist())
+            self._status_ok = np.append(self._status_ok, True)
+            self._active_per_agent = np.append(self._active_per_agent, np.int32(0))
+            self._paused_per_agent = np.append(self._paused_per_agent, np.int32(0))
+            self._total_capacity += capacity
+            if capacity > 0:
+                self._available_count += 1
+            if agent.is_generalist():
+                self._generalist_count += 1
+
         return agent_id
-    
-    def update_agent_status(self, agent_id: str, status: AgentStatus) -> bool:
+
+    def register_many(
+        self,
+        agents: Sequence[Tuple[str, Dict[str, float], int]],
+    ) -> List[str]:
+        """
+        Register a batch of (name, skills, capacity) agents.
+
+        The SoA arrays grow with one concatenate per array instead of a
+        reallocation-and-copy per agent, and each lock is taken once
+        for the whole batch.
+        """
+        created = [
+            Agent(
+                agent_id=f"A{next(self._next_id):012d}",
+                name=name,
+                skills=skills,
+                capacity=capacity,
+            )
+            for name, skills, capacity in agents
+        ]
+        if not created:
+            return []
+
         with self._lock:
-            if agent_id not in self._agents:
-                return False
-            self._agents[agent_id].status = status
-            return True
-    
+            for agent in created:
+                self._agents[agent.agent_id] = agent
+        with self._history_lock:
+            for agent in created:
+                for skill, proficiency in agent.skills.items():
+                    if proficiency >= settings.SKILL_INDEX_MIN_PROFICIENCY:
+                        self._skill_to_agents.setdefault(skill, set()).add(agent.agent_id)
+
+        n = len(created)
+        caps = np.fromiter((a.capacity for a in created), dtype=np.int32, count=n)
+        gen = np.fromiter((a.is_generalist() for a in created), dtype=bool, count=n)
+        zeros = np.zeros(n, dtype=np.int32)
+        with self._array_lock:
+            base = len(self._agent_ids)
+            for offset, agent in enumerate(created):
+                self._agent_index[agent.agent_id] = base + offset
+                self._agent_ids.append(agent.agent_id)
+            self._skill_matrix = np.vstack(
+                [self._skill_matrix] + [a.skills_vec for a in created]
+            )
+            self._has_skill = np.vstack(
+                [self._has_skill] + [a.skills_known for a in created]
+            )
+            self._load_arr = np.concatenate([self._load_arr, zeros])
+            self._capacity_arr = np.concatenate([self._capacity_arr, caps])
+            self._generalist_mask = np.concatenate([self._generalist_mask, gen])
+            self._status_ok = np.concatenate([self._status_ok, np.ones(n, dtype=bool)])
+            self._active_per_agent = np.concatenate([self._active_per_agent, zeros])
+            self._paused_per_agent = np.concatenate([self._paused_per_agent, zeros])
+            self._total_capacity += int(caps.sum())
+            self._available_count += int(np.count_nonzero(caps > 0))
+            self._generalist_count += int(np.count_nonzero(gen))
+
+        return [agent.agent_id for agent in created]
+
+    def _sync_agent_row(self, agent: Agent) -> None:
+        """
+        Mirror an agent's load/status into the SoA arrays after a change
+        and fold the deltas into the registry-wide stat counters.
+        """
+        with self._array_lock:
+            idx = self._agent_index.get(agent.agent_id)
+            if idx is None:
+                return
+            was_available = (
+                bool(self._status_ok[idx])
+                and self._load_arr[idx] < self._capacity_arr[idx]
+            )
+            self._total_load += agent.current_load - int(self._load_arr[idx])
+            self._load_arr[idx] = agent.current_load
+            self._status_ok[idx] = agent.status == AgentStatus.AVAILABLE
+            is_available = (
+                bool(self._status_ok[idx])
+                and self._load_arr[idx] < self._capacity_arr[idx]
+            )
+            self._available_count += int(is_available) - int(was_available)
+            active = int(np.count_nonzero(agent._ticket_status == _TICKET_ACTIVE))
+            paused = int(np.count_nonzero(agent._ticket_status == _TICKET_PAUSED))
+            self._active_total += active - int(self._active_per_agent[idx])
+            self._paused_total += paused - int(self._paused_per_agent[idx])
+            self._active_per_agent[idx] = active
+            self._paused_per_agent[idx] = paused
+
+    def _candidate_agent_ids(self, ticket: TicketRequest) -> Optional[Set[str]]:
+        """
+        Narrow the routing scan using the inverted skill index.
+        Returns None when the index can't help (unknown skills/category),
+        in which case the caller falls back to a full scan.
+        """
+        with self._history_lock:
+            if ticket.required_skills:
+                candidate_sets = [
+                    self._skill_to_agents.get(skill, set())
+                    for skill in ticket.required_skills
+                ]
+                candidates = set.intersection(*candidate_sets)
+            else:
+                candidates = self._skill_to_agents.get(ticket.category.lower())
+            return set(candidates) if candidates else None
+
+    def update_agent_status(self, agent_id: str, status: AgentStatus) -> bool:
+        agent = self.get_agent(agent_id)
+        if agent is None:
+            return False
+        with agent._lock:
+            agent.status = status
+        self._sync_agent_row(agent)
+        return True
+
     def get_available_agents(self) -> List[Agent]:
         """Get list of available agents"""
-        with self._lock:
-            return [a for a in self._agents.values() if a.can_accept_ticket()]
-    
+        return [a for a in self._snapshot_agents() if a.can_accept_ticket()]
+
     def get_agent(self, agent_id: str) -> Optional[Agent]:
         """Get agent by ID"""
         with self._lock:
             return self._agents.get(agent_id)
-    
+
     def compute_eta(self, urgency: float) -> int:
         """
         Compute ETA seconds for a ticket based on urgency.
@@ -222,7 +696,7 @@ class AgentRegistry:
         """
         Route ticket to best available agent using constraint optimization.
         Falls back to preemption if no agent is available and ticket is urgent.
-        
+
         Returns:
             Agent ID if routed successfully, None otherwise
         """
@@ -232,79 +706,139 @@ class AgentRegistry:
     def route_ticket_with_preemption(self, ticket: TicketRequest) -> Tuple[Optional[str], Optional[str]]:
         """
         Route ticket with preemption support.
-        
+
         Returns:
             Tuple of (assigned_agent_id, preempted_ticket_id or None)
         """
-        with self._lock:
-            # First, auto-complete any expired tickets across all agents
-            self._auto_complete_expired()
-
-            available_agents = [a for a in self._agents.values() if a.can_accept_ticket()]
-
-            if available_agents:
-                # Normal routing — pick best agent
-                best_agent = None
-                best_score = -float('inf')
-                
-                for agent in available_agents:
-                    score = self._calculate_agent_score(agent, ticket)
-                    if score > best_score:
-                        best_score = score
-                        best_agent = agent
-                
-                if best_agent:
-                    eta = self.compute_eta(ticket.urgency)
-                    assigned = AssignedTicket(
-                        ticket_id=ticket.ticket_id,
-                        category=ticket.category,
-                        urgency=ticket.urgency,
-                        description=ticket.description,
-                        eta_seconds=eta,
-                    )
-                    best_agent.accept_ticket(assigned)
-                    self._assignment_history.append({
-                        "ticket_id": ticket.ticket_id,
-                        "agent_id": best_agent.agent_id,
-                        "score": best_score,
-                        "eta_seconds": eta,
-                        "preempted": False,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    return best_agent.agent_id, None
-
-            # No available agents — try preemption if urgent enough
-            if ticket.urgency >= settings.PREEMPTION_URGENCY_THRESHOLD:
-                return self._preempt_for_ticket(ticket)
-
-            return None, None
-    
-    def _preempt_for_ticket(self, ticket: TicketRequest) -> Tuple[Optional[str], Optional[str]]:
+        # Fast reject under sustained overload: if nothing has expired,
+        # every seat is taken and the ticket can't preempt, the route
+        # is a guaranteed miss — skip the scoring machinery entirely.
+        if ticket.urgency < settings.PREEMPTION_URGENCY_THRESHOLD:
+            with self._expiry_lock:
+                nothing_expired = (
+                    not self._expiry_heap or self._expiry_heap[0][0] > time.time()
+                )
+            if nothing_expired:
+                with self._array_lock:
+                    if self._total_load >= self._total_capacity:
+                        return None, None
+
+        # First, auto-complete any expired tickets across all agents
+        self._auto_complete_expired()
+
+        scored = self._score_all_agents(ticket)
+        if scored is None:
+            scored = self._score_agents_fallback(ticket)
+
+        if scored:
+            assigned_id = self._accept_best(ticket, scored)
+            if assigned_id is not None:
+                return assigned_id, None
+
+        # No available agents — try preemption if urgent enough
+        if ticket.urgency >= settings.PREEMPTION_URGENCY_THRESHOLD:
+            return self._preempt_for_ticket(ticket)
+
+        return None, None
+
+    def _score_all_agents(self, ticket: TicketRequest) -> Optional[List[Tuple[float, Agent]]]:
         """
-        Find the agent with the lowest-urgency active ticket and preempt it.
+        Score every agent in one vectorized pass over the SoA arrays.
+
+        Returns available (score, agent) pairs sorted best-first, or None
+        when the ticket names a skill outside SKILL_CATEGORIES and the
+        scalar fallback must be used.
         """
-        best_agent = None
-        lowest_ticket = None
-        lowest_urgency = float('inf')
+        with self._array_lock:
+            n = len(self._agent_ids)
+            if n == 0:
+                return []
 
-        for agent in self._agents.values():
-            if agent.status == AgentStatus.OFFLINE:
-                continue
-            t = agent.get_lowest_urgency_active_ticket()
-            if t and t.urgency < lowest_urgency and t.urgency < ticket.urgency:
-                lowest_urgency = t.urgency
-                lowest_ticket = t
-                best_agent = agent
+            if ticket.required_skills:
+                col_indices = [_CATEGORY_INDEX.get(s) for s in ticket.required_skills]
+                if any(idx is None for idx in col_indices):
+                    return None
+                skill = self._skill_matrix[:, col_indices].mean(axis=1)
+            else:
+                cat_idx = _CATEGORY_INDEX.get(ticket.category.lower())
+                if cat_idx is None:
+                    # Unknown category: same 0.5 default as dict.get
+                    skill = np.full(n, 0.5, dtype=np.float32)
+                else:
+                    skill = np.where(
+                        self._has_skill[:, cat_idx],
+                        self._skill_matrix[:, cat_idx],
+                        np.float32(0.5),
+                    )
 
-        if best_agent and lowest_ticket:
-            # Pause the low-priority ticket
-            best_agent.pause_ticket(lowest_ticket.ticket_id)
-            
-            # Don't change current_load (we're swapping, not adding)
-            # But we need to accept the new ticket — decrement load first to allow accept
-            best_agent.current_load -= 1
-            
-            eta = self.compute_eta(ticket.urgency)
+            # Generalist floor, load factor and urgency weighting in one
+            # kernel (native loop under Numba, NumPy-backed otherwise)
+            scores = score_agents(
+                np.ascontiguousarray(skill, dtype=np.float32),
+                self._load_arr,
+                self._capacity_arr,
+                self._generalist_mask,
+                ticket.urgency,
+                settings.GENERALIST_THRESHOLD,
+            )
+
+            available = self._status_ok & (self._load_arr < self._capacity_arr)
+            if not available.any():
+                return []
+            scores = np.where(available, scores, _NEG_INF)
+            order = np.argsort(-scores)
+            candidate_ids = [
+                (float(scores[i]), self._agent_ids[i])
+                for i in order if available[i]
+            ]
+
+        scored = []
+        for score, agent_id in candidate_ids:
+            agent = self.get_agent(agent_id)
+            if agent is not None:
+                scored.append((score, agent))
+        return scored
+
+    def _score_agents_fallback(self, ticket: TicketRequest) -> List[Tuple[float, Agent]]:
+        """Scalar scoring path for tickets the skill matrix can't represent."""
+        candidate_ids = self._candidate_agent_ids(ticket)
+        if candidate_ids is not None:
+            available_agents = [
+                agent for agent in (self.get_agent(aid) for aid in candidate_ids)
+                if agent is not None and agent.can_accept_ticket()
+            ]
+            if not available_agents:
+                # All indexed matches are busy — fall back to the full
+                # scan so low-proficiency agents can still pick it up.
+                available_agents = self.get_available_agents()
+        else:
+            available_agents = self.get_available_agents()
+
+        # Pick the specialized scorer once per route: the common case
+        # has no required skills and never pays the tuple() cache key.
+        if ticket.required_skills:
+            scorer = _score_by_required(tuple(ticket.required_skills))
+        else:
+            scorer = _score_by_category(ticket.category.lower())
+        # The weights depend only on the ticket — compute them once
+        # instead of per agent in the loop.
+        urgency_weight = 0.7 + (0.3 * ticket.urgency)
+        load_weight = 1.0 - urgency_weight
+        scored = [
+            (scorer(agent, urgency_weight, load_weight), agent)
+            for agent in available_agents
+        ]
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return scored
+
+    def _accept_best(self, ticket: TicketRequest, scored: List[Tuple[float, Agent]]) -> Optional[str]:
+        """
+        Try to accept the ticket in best-score order. accept_ticket
+        double-checks capacity under the agent's own lock, so a lost race
+        just falls through to the next candidate.
+        """
+        eta = self.compute_eta(ticket.urgency)
+        for score, agent in scored:
             assigned = AssignedTicket(
                 ticket_id=ticket.ticket_id,
                 category=ticket.category,
@@ -312,7 +846,130 @@ class AgentRegistry:
                 description=ticket.description,
                 eta_seconds=eta,
             )
-            best_agent.accept_ticket(assigned)
+            if not agent.accept_ticket(assigned):
+                continue
+            self._sync_agent_row(agent)
+            self._schedule_expiry(agent.agent_id, assigned)
+            self._heap_push_active(agent.agent_id, assigned)
+            with self._history_lock:
+                self._total_assignments += 1
+                self._assignment_history.append({
+                    "ticket_id": ticket.ticket_id,
+                    "agent_id": agent.agent_id,
+                    "score": score,
+                    "eta_seconds": eta,
+                    "preempted": False,
+                    "ts": time.time()
+                })
+            return agent.agent_id
+        return None
+
+    def _pop_preempt_victim(self, ticket: TicketRequest) -> Optional[Tuple[Agent, AssignedTicket]]:
+        """
+        Pull the lowest-urgency active ticket below the new ticket's
+        urgency off the preemption heap, discarding stale entries.
+        Entries whose agent is offline are kept but skipped.
+        """
+        skipped: List[Tuple[float, int, str, str]] = []
+        victim: Optional[Tuple[Agent, AssignedTicket]] = None
+        while victim is None:
+            with self._preempt_lock:
+                if not self._active_urg_heap:
+                    break
+                entry = self._active_urg_heap[0]
+                if entry[0] >= ticket.urgency:
+                    # Heap root is the global minimum — nothing eligible.
+                    break
+                heapq.heappop(self._active_urg_heap)
+                urgency, version, agent_id, ticket_id = entry
+                if self._ticket_versions.get((agent_id, ticket_id)) != version:
+                    continue
+            agent = self.get_agent(agent_id)
+            if agent is None:
+                continue
+            if agent.status == AgentStatus.OFFLINE:
+                # Still a live entry; revisit once the agent comes back.
+                skipped.append(entry)
+                continue
+            assigned = agent.assigned_tickets.get(ticket_id)
+            if assigned is None or assigned.status != TicketStatus.ACTIVE:
+                continue
+            victim = (agent, assigned)
+        if skipped:
+            with self._preempt_lock:
+                for entry in skipped:
+                    heapq.heappush(self._active_urg_heap, entry)
+        return victim
+
+    def _scan_preempt_victim(self, ticket: TicketRequest) -> Optional[Tuple[Agent, AssignedTicket]]:
+        """
+        Fallback victim scan: concatenate the per-agent SoA ticket
+        arrays into one registry-wide view and let the kernel pick the
+        victim natively — no per-ticket Python loop. Only needed when
+        the heap has no candidates (e.g. tickets assigned outside the
+        registry's routing path).
+        """
+        agents = [a for a in self._snapshot_agents() if a.status != AgentStatus.OFFLINE]
+        counted = [(a, len(a._tids)) for a in agents if a._tids]
+        if not counted:
+            return None
+
+        urgencies = np.concatenate([a._urg for a, _ in counted])
+        statuses = np.concatenate([a._ticket_status for a, _ in counted])
+        sizes = np.array([n for _, n in counted], dtype=np.int32)
+        agent_of = np.repeat(np.arange(len(counted), dtype=np.int32), sizes)
+
+        victim_agent_idx, victim_ticket_idx = find_preempt_victim(
+            urgencies, statuses, agent_of, ticket.urgency, int(_TICKET_ACTIVE),
+        )
+        if victim_ticket_idx < 0:
+            return None
+        agent = counted[victim_agent_idx][0]
+        offset = int(sizes[:victim_agent_idx].sum())
+        assigned = agent.assigned_tickets.get(agent._tids[victim_ticket_idx - offset])
+        if assigned is None:
+            return None
+        return agent, assigned
+
+    def _preempt_for_ticket(self, ticket: TicketRequest) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Find the agent with the lowest-urgency active ticket and preempt it.
+        """
+        victim = self._pop_preempt_victim(ticket)
+        if victim is None:
+            victim = self._scan_preempt_victim(ticket)
+
+        best_agent, lowest_ticket = victim if victim else (None, None)
+
+        if best_agent and lowest_ticket:
+            with best_agent._lock:
+                # Re-verify under the agent's lock: the victim may have
+                # completed or been preempted by a concurrent route.
+                current = best_agent.assigned_tickets.get(lowest_ticket.ticket_id)
+                if current is None or current.status != TicketStatus.ACTIVE:
+                    return None, None
+
+                # Pause the low-priority ticket
+                best_agent._pause_locked(lowest_ticket.ticket_id)
+
+                # Don't change current_load (we're swapping, not adding)
+                # But we need to accept the new ticket — decrement load first to allow accept
+                best_agent.current_load -= 1
+
+                eta = self.compute_eta(ticket.urgency)
+                assigned = AssignedTicket(
+                    ticket_id=ticket.ticket_id,
+                    category=ticket.category,
+                    urgency=ticket.urgency,
+                    description=ticket.description,
+                    eta_seconds=eta,
+                )
+                best_agent._accept_locked(assigned)
+            self._sync_agent_row(best_agent)
+            self._invalidate_expiry(best_agent.agent_id, lowest_ticket.ticket_id)
+            self._heap_invalidate_active(best_agent.agent_id, lowest_ticket.ticket_id)
+            self._schedule_expiry(best_agent.agent_id, assigned)
+            self._heap_push_active(best_agent.agent_id, assigned)
 
             # Record preemption event
             event = {
@@ -322,131 +979,187 @@ class AgentRegistry:
                 "paused_urgency": lowest_ticket.urgency,
                 "agent_id": best_agent.agent_id,
                 "agent_name": best_agent.name,
-                "timestamp": datetime.now().isoformat()
+                "ts": time.time()
             }
-            self._preemption_history.append(event)
-            self._assignment_history.append({
-                "ticket_id": ticket.ticket_id,
-                "agent_id": best_agent.agent_id,
-                "score": 0,
-                "eta_seconds": eta,
-                "preempted": True,
-                "preempted_ticket": lowest_ticket.ticket_id,
-                "timestamp": datetime.now().isoformat()
-            })
+            with self._history_lock:
+                self._total_preemptions += 1
+                self._total_assignments += 1
+                self._preemption_history.append(event)
+                self._assignment_history.append({
+                    "ticket_id": ticket.ticket_id,
+                    "agent_id": best_agent.agent_id,
+                    "score": 0,
+                    "eta_seconds": eta,
+                    "preempted": True,
+                    "preempted_ticket": lowest_ticket.ticket_id,
+                    "ts": time.time()
+                })
 
-            print(f"⚡ PREEMPTION: {ticket.ticket_id} (urg={ticket.urgency:.2f}) "
-                  f"bumped {lowest_ticket.ticket_id} (urg={lowest_ticket.urgency:.2f}) "
-                  f"on agent {best_agent.name}")
+            # %s-style args defer formatting until the level is enabled
+            logger.debug(
+                "PREEMPTION: %s (urg=%.2f) bumped %s (urg=%.2f) on agent %s",
+                ticket.ticket_id, ticket.urgency,
+                lowest_ticket.ticket_id, lowest_ticket.urgency,
+                best_agent.name,
+            )
 
             return best_agent.agent_id, lowest_ticket.ticket_id
 
         return None, None
 
     def _auto_complete_expired(self):
-        """Auto-complete tickets whose ETA has elapsed"""
-        for agent in self._agents.values():
-            expired = [tid for tid, t in agent.assigned_tickets.items() if t.is_expired()]
-            for tid in expired:
+        """
+        Auto-complete tickets whose ETA has elapsed.
+
+        Driven by the expiry heap: pops only entries whose deadline has
+        passed, so routing does O(1) work here when nothing is expiring.
+        Entries invalidated by pause/release are discarded lazily.
+        """
+        now = time.time()
+        while True:
+            with self._expiry_lock:
+                if not self._expiry_heap or self._expiry_heap[0][0] > now:
+                    return
+                _, agent_id, ticket_id = heapq.heappop(self._expiry_heap)
+                if (agent_id, ticket_id) in self._invalidated:
+                    self._invalidated.discard((agent_id, ticket_id))
+                    continue
+            agent = self.get_agent(agent_id)
+            if agent is None:
+                continue
+            ticket = agent.assigned_tickets.get(ticket_id)
+            if ticket is None or ticket.status != TicketStatus.ACTIVE:
+                continue
+            if not ticket.is_expired():
+                # Stale deadline (ticket was paused and resumed) —
+                # re-queue at its current deadline.
+                self._schedule_expiry(agent_id, ticket)
+                continue
+            # One expired ticket usually means siblings on the same
+            # agent are due too — release them all in one vectorized
+            # check instead of waiting for each heap entry.
+            released = 0
+            for tid in agent.expired_ticket_ids(now):
                 agent.release_ticket(tid)
-                # Auto-resume paused tickets on this agent
+                released += 1
+                self._heap_invalidate_active(agent_id, tid)
+                if tid != ticket_id:
+                    # The popped entry is already off the heap; siblings
+                    # still have entries that must go stale.
+                    self._invalidate_expiry(agent_id, tid)
+            # Auto-resume paused tickets on this agent: one per seat the
+            # sweep freed, matching the per-release resume of the
+            # one-at-a-time heap path. Extra calls no-op once nothing is
+            # paused.
+            for _ in range(released):
                 self._resume_next_paused(agent)
+            self._sync_agent_row(agent)
 
     def _resume_next_paused(self, agent: Agent):
         """Resume the highest-urgency paused ticket on an agent"""
-        paused = [t for t in agent.assigned_tickets.values() if t.status == TicketStatus.PAUSED]
-        if paused:
-            highest = max(paused, key=lambda t: t.urgency)
-            agent.resume_ticket(highest.ticket_id)
+        if not agent._tids:
+            return
+        masked = np.where(agent._ticket_status == _TICKET_PAUSED, agent._urg, _NEG_INF)
+        idx = int(np.argmax(masked))
+        if masked[idx] == _NEG_INF:
+            return
+        highest = agent.assigned_tickets.get(agent._tids[idx])
+        if highest is not None and agent.resume_ticket(highest.ticket_id):
+            self._schedule_expiry(agent.agent_id, highest)
+            self._heap_push_active(agent.agent_id, highest)
 
     def complete_ticket(self, agent_id: str, ticket_id: str) -> bool:
         """
         Complete a ticket on a specific agent.
         Auto-resumes paused tickets after completion.
         """
-        with self._lock:
-            agent = self._agents.get(agent_id)
-            if not agent:
-                return False
-            released = agent.release_ticket(ticket_id)
-            if released:
-                self._resume_next_paused(agent)
-            return released
+        agent = self.get_agent(agent_id)
+        if not agent:
+            return False
+        released = agent.release_ticket(ticket_id)
+        if released:
+            self._invalidate_expiry(agent_id, ticket_id)
+            self._heap_invalidate_active(agent_id, ticket_id)
+            self._resume_next_paused(agent)
+            self._sync_agent_row(agent)
+        return released
 
-    def _calculate_agent_score(self, agent: Agent, ticket: TicketRequest) -> float:
-        """
-        Calculate agent suitability score for a ticket.
-        
-        Score = skill_match * urgency_weight + availability_factor
-        
-        Enhanced: generalist agents (>=50% in all skills) get a minimum 
-        skill score of 0.5 for any category.
-        """
-        # Skill match score
-        skill_score = 0.0
-        if ticket.required_skills:
-            for skill in ticket.required_skills:
-                skill_score += agent.skills.get(skill, 0.0)
-            skill_score /= len(ticket.required_skills)
-        else:
-            skill_score = agent.skills.get(ticket.category.lower(), 0.5)
-        
-        # Generalist bonus: if all skills >= 50%, guarantee at least 0.5 match
-        if agent.is_generalist() and skill_score < settings.GENERALIST_THRESHOLD:
-            skill_score = settings.GENERALIST_THRESHOLD
-        
-        # Availability factor (prefer less loaded agents)
-        load_factor = 1.0 - (agent.current_load / agent.capacity)
-        
-        # Urgency weight (higher urgency = more important skill match)
-        urgency_weight = 0.7 + (0.3 * ticket.urgency)
-        
-        # Final score
-        score = (skill_score * urgency_weight) + (load_factor * (1 - urgency_weight))
-        
-        return score
-    
     def release_ticket_by_id(self, agent_id: str) -> bool:
         """Release a generic ticket from an agent (backwards compat)."""
-        with self._lock:
-            if agent_id in self._agents:
-                return self._agents[agent_id].release_ticket()
+        agent = self.get_agent(agent_id)
+        if agent is not None:
+            released = agent.release_ticket()
+            if released:
+                self._sync_agent_row(agent)
+            return released
         return False
-    
+
+    @staticmethod
+    def _with_timestamp(item: Dict) -> Dict:
+        """Format an epoch-float history entry for external consumers"""
+        return {**item, "timestamp": datetime.fromtimestamp(item["ts"]).isoformat()}
+
+    def get_assignment_history(self, limit: int = 20) -> List[Dict]:
+        """Get recent assignment events, most recent last"""
+        with self._history_lock:
+            start = max(0, len(self._assignment_history) - limit)
+            recent = list(itertools.islice(self._assignment_history, start, None))
+        return [self._with_timestamp(item) for item in recent]
+
     def get_preemption_history(self, limit: int = 20) -> List[Dict]:
         """Get recent preemption events"""
-        with self._lock:
-            return self._preemption_history[-limit:]
+        with self._history_lock:
+            start = max(0, len(self._preemption_history) - limit)
+            recent = list(itertools.islice(self._preemption_history, start, None))
+        return [self._with_timestamp(item) for item in recent]
 
-    def get_stats(self) -> Dict:
-        """Get routing statistics"""
-        with self._lock:
-            total_agents = len(self._agents)
-            available = sum(1 for a in self._agents.values() if a.can_accept_ticket())
-            total_load = sum(a.current_load for a in self._agents.values())
-            total_capacity = sum(a.capacity for a in self._agents.values())
+    def get_stats(self, verify: bool = False) -> Dict:
+        """
+        Get routing statistics.
+
+        Reads the incrementally-maintained counters in O(1); pass
+        verify=True to recompute everything with a full registry scan
+        (kept for parity checks).
+        """
+        if verify:
+            agents = self._snapshot_agents()
+            total_agents = len(agents)
+            available = sum(1 for a in agents if a.can_accept_ticket())
+            total_load = sum(a.current_load for a in agents)
+            total_capacity = sum(a.capacity for a in agents)
             total_active = sum(
-                sum(1 for t in a.assigned_tickets.values() if t.status == TicketStatus.ACTIVE)
-                for a in self._agents.values()
+                int(np.count_nonzero(a._ticket_status == _TICKET_ACTIVE)) for a in agents
             )
             total_paused = sum(
-                sum(1 for t in a.assigned_tickets.values() if t.status == TicketStatus.PAUSED)
-                for a in self._agents.values()
+                int(np.count_nonzero(a._ticket_status == _TICKET_PAUSED)) for a in agents
             )
-            generalists = sum(1 for a in self._agents.values() if a.is_generalist())
-            
-            return {
-                "total_agents": total_agents,
-                "available_agents": available,
-                "total_current_load": total_load,
-                "total_capacity": total_capacity,
-                "utilization": total_load / total_capacity if total_capacity > 0 else 0,
-                "total_assignments": len(self._assignment_history),
-                "total_preemptions": len(self._preemption_history),
-                "active_tickets": total_active,
-                "paused_tickets": total_paused,
-                "generalist_agents": generalists,
-            }
+            generalists = sum(1 for a in agents if a.is_generalist())
+        else:
+            with self._array_lock:
+                total_agents = len(self._agent_ids)
+                available = self._available_count
+                total_load = self._total_load
+                total_capacity = self._total_capacity
+                total_active = self._active_total
+                total_paused = self._paused_total
+                generalists = self._generalist_count
+
+        with self._history_lock:
+            total_assignments = self._total_assignments
+            total_preemptions = self._total_preemptions
+
+        return {
+            "total_agents": total_agents,
+            "available_agents": available,
+            "total_current_load": total_load,
+            "total_capacity": total_capacity,
+            "utilization": total_load / total_capacity if total_capacity > 0 else 0,
+            "total_assignments": total_assignments,
+            "total_preemptions": total_preemptions,
+            "active_tickets": total_active,
+            "paused_tickets": total_paused,
+            "generalist_agents": generalists,
+        }
 
 
 # Global agent registry
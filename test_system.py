@@ -0,0 +1,248 @@
+"""
+End-to-end system tests for the Smart-Support API.
+Run the server first (python app.py), then: python test_system.py
+
+All tests share one httpx.AsyncClient with a keep-alive pool (HTTP/2
+enabled), so requests reuse connections instead of paying a fresh
+TCP handshake per call.
+"""
+import asyncio
+import sys
+from typing import List, Optional, Tuple
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+API_BASE = "http://localhost:8001"
+BATCH_SIZE = 8  # tickets per bulk request; workload-dependent sweet spot
+
+_CLIENT: Optional["httpx.AsyncClient"] = None
+
+# Buffered test results, printed in one pass after the run: concurrent
+# tasks append to a list instead of contending on the stdout lock.
+_RESULTS: List[Tuple[str, str]] = []
+
+
+def _record(name: str, details: str = "") -> None:
+    _RESULTS.append((name, details))
+
+
+def _flush_results() -> None:
+    out = sys.stdout
+    for name, details in _RESULTS:
+        out.write(f"  ✅ {name} ({details})\n" if details else f"  ✅ {name}\n")
+    out.flush()
+
+
+async def get_client() -> "httpx.AsyncClient":
+    """Lazily build the shared pooled client."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.AsyncClient(
+            base_url=API_BASE,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=10.0,
+        )
+    return _CLIENT
+
+
+async def _spawn_all(coros: list) -> list:
+    """
+    Run coroutines concurrently via TaskGroup (Py 3.11+), which
+    schedules and propagates exceptions more tightly than gather;
+    fall back to gather on older runtimes.
+    """
+    if hasattr(asyncio, "TaskGroup"):
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(c) for c in coros]
+        return [t.result() for t in tasks]
+    return list(await asyncio.gather(*coros))
+
+
+async def _wait_for_api(timeout: float = 15.0) -> None:
+    """Poll /health until the server answers (fresh start lag)."""
+    client = await get_client()
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        try:
+            r = await client.get("/health")
+            if r.status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if asyncio.get_running_loop().time() >= deadline:
+            raise RuntimeError(f"API at {API_BASE} not ready within {timeout}s")
+        await asyncio.sleep(0.25)
+
+
+def _sample_ticket(n: int = 0) -> dict:
+    return {
+        "subject": f"Cannot access my invoice #{n}",
+        "description": "The billing page returns an error when I open my latest invoice.",
+        "customer_id": f"CUST-{n:04d}",
+    }
+
+
+async def test_api_health():
+    client = await get_client()
+    r = await client.get("/health")
+    assert r.status_code == 200, r.text
+    _record("health endpoint")
+
+
+async def test_create_ticket() -> str:
+    client = await get_client()
+    r = await client.post("/api/tickets", json=_sample_ticket())
+    assert r.status_code == 202, r.text
+    data = r.json()
+    assert data["ticket_id"].startswith("TKT-")
+    _record("create ticket", f"{data['ticket_id']}, category={data.get('category')}")
+    return data["ticket_id"]
+
+
+async def test_list_tickets():
+    client = await get_client()
+    r = await client.get("/api/tickets")
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert "tickets" in data
+    _record("list tickets", f"{data.get('total', len(data['tickets']))} total")
+
+
+async def test_get_ticket(ticket_id: str):
+    client = await get_client()
+    r = await client.get(f"/api/tickets/{ticket_id}")
+    assert r.status_code == 200, r.text
+    assert r.json()["ticket_id"] == ticket_id
+    _record("get ticket by id")
+
+
+async def test_update_priority(ticket_id: str):
+    client = await get_client()
+    r = await client.put(f"/api/tickets/{ticket_id}/priority", json={"priority": 0.9})
+    assert r.status_code == 200, r.text
+    _record("update priority")
+
+
+async def test_delete_ticket(ticket_id: str):
+    client = await get_client()
+    r = await client.delete(f"/api/tickets/{ticket_id}")
+    assert r.status_code == 200, r.text
+    _record("delete (cancel) ticket")
+
+
+async def test_duplicate_detection():
+    """A repeated ticket within the dedup window is flagged, not rejected."""
+    client = await get_client()
+    ticket = {
+        "subject": "VPN tunnel drops every 90 seconds on the Berlin gateway",
+        "description": "Since this morning the tunnel renegotiates constantly and all sessions drop.",
+        "customer_id": "CUST-DUP1",
+    }
+    first = await client.post("/api/tickets", json=ticket)
+    assert first.status_code == 202, first.text
+    assert first.json()["duplicate_of"] is None, first.text
+
+    second = await client.post(
+        "/api/tickets", json={**ticket, "customer_id": "CUST-DUP2"}
+    )
+    assert second.status_code == 202, second.text
+    data = second.json()
+    assert data["duplicate_of"] == first.json()["ticket_id"], data
+    _record("duplicate detection", f"{data['ticket_id']} flagged as {data['duplicate_of']}")
+
+
+async def _create_ticket_aiohttp(session: "aiohttp.ClientSession", ticket: dict) -> str:
+    async with session.post(f"{API_BASE}/api/tickets", json=ticket) as r:
+        assert r.status == 202, await r.text()
+        return (await r.json())["ticket_id"]
+
+
+async def test_concurrent_requests(count: int = 15):
+    """
+    Fire simultaneous creates. Uses aiohttp when installed — httpx's
+    AsyncClient is measurably slower under high request concurrency —
+    and falls back to the shared httpx pool otherwise. The CRUD tests
+    stay on httpx for coverage of both clients.
+    """
+    if AIOHTTP_AVAILABLE:
+        connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            ticket_ids = await _spawn_all(
+                [_create_ticket_aiohttp(session, _sample_ticket(n)) for n in range(count)]
+            )
+        label = "aiohttp"
+    else:
+        client = await get_client()
+
+        async def create(n: int) -> str:
+            r = await client.post("/api/tickets", json=_sample_ticket(n))
+            assert r.status_code == 202, r.text
+            return r.json()["ticket_id"]
+
+        ticket_ids = await _spawn_all([create(n) for n in range(count)])
+        label = "httpx"
+    assert len(set(ticket_ids)) == count
+    _record("concurrent creates", f"{count} via {label}")
+
+
+async def test_bulk_create(count: int = 15):
+    """Submit tickets as overlapping bulk batches instead of one POST each."""
+    client = await get_client()
+    tickets = [_sample_ticket(100 + n) for n in range(count)]
+    batches = [tickets[i:i + BATCH_SIZE] for i in range(0, count, BATCH_SIZE)]
+
+    responses = await _spawn_all([
+        client.post("/api/tickets/bulk", json={"tickets": batch}) for batch in batches
+    ])
+    ticket_ids = []
+    for r in responses:
+        assert r.status_code == 202, r.text
+        ticket_ids.extend(t["ticket_id"] for t in r.json()["tickets"])
+    assert len(set(ticket_ids)) == count
+    _record("bulk create", f"{count} tickets via {len(batches)} batches")
+
+
+async def run_all_tests():
+    if not HTTPX_AVAILABLE:
+        print("httpx is not installed — skipping system tests "
+              "(pip install -r requirements.txt)")
+        return
+    print("Running system tests against", API_BASE)
+    if hasattr(asyncio, "eager_task_factory"):
+        # Py 3.12+: run each new task up to its first await immediately,
+        # skipping a scheduler round-trip per spawned request.
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    try:
+        await _wait_for_api()
+        await test_api_health()
+        ticket_id = await test_create_ticket()
+        await test_list_tickets()
+        await test_get_ticket(ticket_id)
+        await test_update_priority(ticket_id)
+        await test_delete_ticket(ticket_id)
+        await test_duplicate_detection()
+        await test_concurrent_requests()
+        await test_bulk_create()
+        _flush_results()
+        print("All system tests passed.")
+    except BaseException:
+        _flush_results()
+        raise
+    finally:
+        if _CLIENT is not None:
+            await _CLIENT.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_all_tests())
@@ -0,0 +1,8 @@
+"""In-memory priority queue package for Smart-Support Ticket Routing Engine"""
+from ticket_queue.priority_queue import (
+    Ticket,
+    PriorityQueue,
+    fast_ticket_id,
+    make_ticket_id,
+    ticket_queue,
+)
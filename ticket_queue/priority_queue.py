@@ -0,0 +1,260 @@
+"""
+In-Memory Priority Ticket Queue
+Holds classified tickets ordered by priority until an agent picks them up.
+
+Backed by an indexed binary heap: a position map (ticket_id -> heap
+slot) kept in lock-step with every swap lets priority updates and
+removals sift the affected entry in O(log N), with no tombstones to
+skip on dequeue and no periodic compaction.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+# Anchor pair for converting monotonic construction stamps back to wall
+# time on display: wall = _EPOCH_WALL + (created_ns - _EPOCH_MONO_NS)
+_EPOCH_WALL = time.time()
+_EPOCH_MONO_NS = time.monotonic_ns()
+
+
+@dataclass(order=True, slots=True)
+class Ticket:
+    """A classified ticket waiting in the queue"""
+    ticket_id: str = field(compare=False)
+    subject: str = field(compare=False)
+    description: str = field(compare=False)
+    category: str = field(compare=False)
+    urgency: float = field(compare=False)   # Classifier output (0-1)
+    priority: float = field(compare=False)  # Queue ordering key; starts as urgency
+    customer_id: str = field(compare=False)
+    status: str = field(default="queued", compare=False)
+    # Monotonic construction stamp: one cheap clock read, no datetime
+    # allocation on the enqueue path, and immune to wall-clock jumps
+    # that would reorder the age tie-break. created_at formats lazily.
+    created_ns: int = field(
+        default_factory=time.monotonic_ns, compare=False, repr=False
+    )
+    # Precomputed min-heap key (higher priority first, older tickets
+    # break ties): heap comparisons are one C-level tuple compare
+    # instead of Python-level branches per pair.
+    _sort_key: Tuple[float, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._sort_key = (-self.priority, self.created_ns)
+
+    @property
+    def created_at(self) -> datetime:
+        """Wall-clock creation time, derived from the monotonic stamp"""
+        wall = _EPOCH_WALL + (self.created_ns - _EPOCH_MONO_NS) / 1e9
+        return datetime.fromtimestamp(wall, timezone.utc)
+
+
+# Batched entropy for ID generation: one getrandom syscall refills
+# enough bytes for 1024 IDs instead of one syscall per uuid4().
+_RAND_BUF = bytearray()
+_RAND_LOCK = threading.Lock()
+
+
+def fast_ticket_id() -> str:
+    """128-bit random hex ID; entropy drawn from a batched urandom pool."""
+    global _RAND_BUF
+    with _RAND_LOCK:
+        if len(_RAND_BUF) < 16:
+            _RAND_BUF = bytearray(os.urandom(16 * 1024))
+        chunk = bytes(_RAND_BUF[:16])
+        del _RAND_BUF[:16]
+    return chunk.hex()
+
+
+def make_ticket_id() -> str:
+    """Generate a ticket ID in the API's TKT-XXXXXXXX shape"""
+    return f"TKT-{fast_ticket_id()[:8].upper()}"
+
+
+class PriorityQueue:
+    """
+    Thread-safe priority queue of tickets.
+
+    The heap orders tickets by priority (then age); _ticket_index maps
+    ticket_id -> live Ticket for O(1) lookups and _pos maps ticket_id
+    -> current heap slot. Every swap updates _pos, so priority changes
+    and removals sift the one affected entry in O(log N) instead of
+    tombstoning it and rebuilding later.
+    """
+
+    __slots__ = ("_heap", "_ticket_index", "_pos", "_lock")
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._heap: List[Ticket] = []
+        self._ticket_index: Dict[str, Ticket] = {}
+        self._pos: Dict[str, int] = {}
+        # Pre-grow the dicts: CPython never shrinks a dict's table when
+        # keys are deleted (clear() would free it), so filling and then
+        # del-draining reserves capacity — the first initial_capacity
+        # inserts trigger no rehash.
+        for index in (self._ticket_index, self._pos):
+            for i in range(initial_capacity):
+                index[i] = None
+            for i in range(initial_capacity):
+                del index[i]
+        # Plain Lock (no re-entrancy bookkeeping): it guards only the
+        # mutators, which never nest. Read paths go lock-free — single
+        # dict.get / len / list() calls are atomic under the GIL.
+        self._lock = threading.Lock()
+
+    # -- heap primitives (callers hold self._lock) --
+
+    def _swap(self, i: int, j: int) -> None:
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i].ticket_id] = i
+        self._pos[heap[j].ticket_id] = j
+
+    def _sift_up(self, i: int) -> None:
+        heap = self._heap
+        while i > 0:
+            parent = (i - 1) >> 1
+            if heap[i] < heap[parent]:
+                self._swap(i, parent)
+                i = parent
+            else:
+                break
+
+    def _sift_down(self, i: int) -> None:
+        heap = self._heap
+        n = len(heap)
+        while True:
+            smallest = i
+            left = 2 * i + 1
+            right = left + 1
+            if left < n and heap[left] < heap[smallest]:
+                smallest = left
+            if right < n and heap[right] < heap[smallest]:
+                smallest = right
+            if smallest == i:
+                break
+            self._swap(i, smallest)
+            i = smallest
+
+    def _pop_at(self, i: int) -> Ticket:
+        """Remove and return the entry at heap slot i, restoring shape."""
+        heap = self._heap
+        ticket = heap[i]
+        last = heap.pop()
+        del self._pos[ticket.ticket_id]
+        if i < len(heap):
+            heap[i] = last
+            self._pos[last.ticket_id] = i
+            self._sift_down(i)
+            self._sift_up(i)
+        return ticket
+
+    # -- public API --
+
+    def enqueue(self, ticket: Ticket) -> bool:
+        """Add a ticket to the queue. Returns False on duplicate ID."""
+        with self._lock:
+            if ticket.ticket_id in self._ticket_index:
+                return False
+            self._ticket_index[ticket.ticket_id] = ticket
+            self._heap.append(ticket)
+            self._pos[ticket.ticket_id] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return True
+
+    def enqueue_many(self, tickets: List[Ticket]) -> List[str]:
+        """
+        Bulk insert under one lock acquisition: append everything and
+        restore the heap in one bottom-up pass (O(N+K)) instead of K
+        pushes at O(log N) each. Returns the IDs actually added
+        (duplicates are skipped).
+        """
+        with self._lock:
+            added = []
+            for ticket in tickets:
+                if ticket.ticket_id in self._ticket_index:
+                    continue
+                self._ticket_index[ticket.ticket_id] = ticket
+                self._heap.append(ticket)
+                self._pos[ticket.ticket_id] = len(self._heap) - 1
+                added.append(ticket.ticket_id)
+            if added:
+                for i in range(len(self._heap) // 2 - 1, -1, -1):
+                    self._sift_down(i)
+            return added
+
+    def dequeue(self) -> Optional[Ticket]:
+        """Pop the highest-priority ticket, or None if the queue is empty."""
+        with self._lock:
+            if not self._heap:
+                return None
+            ticket = self._pop_at(0)
+            del self._ticket_index[ticket.ticket_id]
+            return ticket
+
+    def peek(self) -> Optional[Ticket]:
+        """Return the highest-priority ticket without removing it."""
+        with self._lock:
+            return self._heap[0] if self._heap else None
+
+    def update_priority(self, ticket_id: str, new_priority: float) -> bool:
+        """
+        Change a queued ticket's priority in O(log N): mutate its sort
+        key in place and sift it from its current slot — up if the
+        priority rose, down if it fell.
+        """
+        with self._lock:
+            current = self._ticket_index.get(ticket_id)
+            if current is None:
+                return False
+            old_key = current._sort_key
+            current.priority = new_priority
+            current._sort_key = (-new_priority, current.created_ns)
+            i = self._pos[ticket_id]
+            if current._sort_key < old_key:
+                self._sift_up(i)
+            else:
+                self._sift_down(i)
+            return True
+
+    def remove_ticket(self, ticket_id: str) -> bool:
+        """Remove a ticket from an arbitrary heap slot in O(log N).
+
+        Returns True if the ticket was queued, False otherwise."""
+        with self._lock:
+            if ticket_id not in self._ticket_index:
+                return False
+            del self._ticket_index[ticket_id]
+            self._pop_at(self._pos[ticket_id])
+            return True
+
+    def get_by_id(self, ticket_id: str) -> Optional[Ticket]:
+        """Look up a queued ticket by ID (lock-free snapshot read)"""
+        return self._ticket_index.get(ticket_id)
+
+    def get_all(self) -> List[Ticket]:
+        """Snapshot of all queued tickets (unordered, lock-free)"""
+        return list(self._ticket_index.values())
+
+    def size(self) -> int:
+        """Number of live tickets in the queue (lock-free)"""
+        return len(self._ticket_index)
+
+    def is_empty(self) -> bool:
+        return not self._ticket_index
+
+    def clear(self) -> int:
+        """Drop all queued tickets; returns how many were removed."""
+        with self._lock:
+            count = len(self._ticket_index)
+            self._heap.clear()
+            self._ticket_index.clear()
+            self._pos.clear()
+            return count
+
+
+# Global ticket queue
+ticket_queue = PriorityQueue()
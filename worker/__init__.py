@@ -0,0 +1,2 @@
+"""Background worker package for Smart-Support Ticket Routing Engine"""
+from worker.webhooks import WebhookNotifier, webhook_notifier
@@ -0,0 +1,305 @@
+"""
+Webhook Notifications for High-Urgency Tickets
+Sends alerts to Slack and/or Discord when urgent tickets arrive.
+
+Both channels share one long-lived httpx.AsyncClient with a keep-alive
+pool, so alerts reuse warm connections instead of paying a fresh
+TCP+TLS handshake per send.
+"""
+import asyncio
+import random
+from datetime import datetime
+from typing import Optional, Tuple
+
+import httpx
+import orjson
+
+from config import settings
+from log_utils import make_queue_logger
+
+# Failure/retry reporting happens on the event loop, so it goes
+# through the shared queue-backed logger rather than print().
+logger = make_queue_logger(__name__)
+
+# orjson.dumps returns bytes, sent via content= so httpx skips its own
+# stdlib-json serialization; the header must then be set by hand.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Static payload skeletons, serialized to bytes once at import and
+# split on sentinel placeholders: per alert the "serialization" is
+# orjson-encoding the handful of dynamic strings (which handles JSON
+# escaping) and joining them between the pre-encoded byte chunks.
+_SLACK_BODY_TMPL = (
+    "*Ticket:* {ticket_id}\n"
+    "*Category:* {category}\n"
+    "*Urgency:* {urgency:.2f}\n"
+    "*Description:* {description}\n"
+    "*At:* {at}"
+)
+
+_DISCORD_FIELD_NAMES = ("Ticket", "Category", "Urgency", "Description")
+
+# \x00 can't appear in real ticket text that survives JSON encoding of
+# our own placeholders, so it makes an unambiguous sentinel.
+_COLOR_SENTINEL = -987654321
+
+# Per-channel concurrency caps: a burst of urgent tickets fans out to
+# at most this many simultaneous connections per webhook, keeping us
+# under upstream rate limits while retries smooth over blips.
+_SLACK_SEM = asyncio.Semaphore(8)
+_DISCORD_SEM = asyncio.Semaphore(8)
+_MAX_ATTEMPTS = 3
+
+# Bounds on quoted ticket text — keeps payloads under webhook size
+# limits and avoids copying long descriptions wholesale into alerts.
+_SUBJECT_LIMIT = 200
+_DESCRIPTION_LIMIT = 100
+
+
+def _split_template(skeleton: dict, placeholders: list) -> list:
+    """Serialize a skeleton and split it into byte chunks around the
+    encoded placeholder values, in order."""
+    blob = orjson.dumps(skeleton)
+    chunks = []
+    for token in placeholders:
+        before, blob = blob.split(token, 1)
+        chunks.append(before)
+    chunks.append(blob)
+    return chunks
+
+
+_SLACK_CHUNKS = _split_template(
+    {
+        "text": "\x00header\x00",
+        "blocks": [
+            {"type": "section", "text": {"type": "mrkdwn", "text": "\x00body\x00"}}
+        ],
+    },
+    [orjson.dumps("\x00header\x00"), orjson.dumps("\x00body\x00")],
+)
+
+_DISCORD_CHUNKS = _split_template(
+    {
+        "embeds": [
+            {
+                "title": "\x00title\x00",
+                "color": _COLOR_SENTINEL,
+                "fields": [
+                    {"name": name, "value": f"\x00field{i}\x00"}
+                    for i, name in enumerate(_DISCORD_FIELD_NAMES)
+                ],
+                "timestamp": "\x00at\x00",
+            }
+        ]
+    },
+    [orjson.dumps("\x00title\x00"), str(_COLOR_SENTINEL).encode()]
+    + [orjson.dumps(f"\x00field{i}\x00") for i in range(len(_DISCORD_FIELD_NAMES))]
+    + [orjson.dumps("\x00at\x00")],
+)
+
+# Severity tiers, highest threshold first: one table drives both the
+# Slack emoji and the Discord embed color instead of per-channel
+# if/elif ladders. send_alert's threshold guard means the scan always
+# terminates within these entries.
+_SEVERITY = (
+    (0.95, "🔥", 0xE01E5A),
+    (0.90, "🚨", 0xECB22E),
+    (0.0, "⚠️", 0x36C5F0),
+)
+
+
+def _severity(urgency: float) -> Tuple[str, int]:
+    """Map an urgency to its (emoji, color) tier."""
+    for threshold, emoji, color in _SEVERITY:
+        if urgency >= threshold:
+            return emoji, color
+    return _SEVERITY[-1][1:]
+
+
+def _build_slack_payload(
+    ticket_id: str, subject: str, category: str, urgency: float,
+    description: str, customer_id: Optional[str], emoji: str, at: str,
+) -> bytes:
+    body = _SLACK_BODY_TMPL.format(
+        ticket_id=ticket_id,
+        category=category,
+        urgency=urgency,
+        description=description,
+        at=at,
+    )
+    if customer_id:
+        body += f"\n*Customer:* {customer_id}"
+    c = _SLACK_CHUNKS
+    return b"".join((
+        c[0],
+        orjson.dumps(f"{emoji} High-urgency ticket: {subject}"),
+        c[1],
+        orjson.dumps(body),
+        c[2],
+    ))
+
+
+def _build_discord_payload(
+    ticket_id: str, subject: str, category: str, urgency: float,
+    description: str, color: int, at: str,
+) -> bytes:
+    c = _DISCORD_CHUNKS
+    return b"".join((
+        c[0],
+        orjson.dumps(f"High-urgency ticket: {subject}"),
+        c[1],
+        str(color).encode(),
+        c[2],
+        orjson.dumps(ticket_id),
+        c[3],
+        orjson.dumps(category),
+        c[4],
+        orjson.dumps(f"{urgency:.2f}"),
+        c[5],
+        orjson.dumps(description or "-"),
+        c[6],
+        orjson.dumps(at),
+        c[7],
+    ))
+
+
+class WebhookNotifier:
+    """
+    Posts high-urgency ticket alerts to the configured webhooks.
+
+    Channels without a configured URL are skipped silently, so the
+    notifier is safe to call even when no webhook is set up.
+    """
+
+    def __init__(self):
+        self.slack_url = settings.SLACK_WEBHOOK_URL
+        self.discord_url = settings.DISCORD_WEBHOOK_URL
+        # One pooled client for the notifier's lifetime; closed via
+        # aclose() at worker shutdown. HTTP/2 lets a burst of alerts
+        # multiplex over one TLS connection per host instead of
+        # queueing behind sequential connection setups, so the pool is
+        # sized generously with a tight connect timeout.
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(10.0, connect=2.0),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled client (call once at shutdown)."""
+        await self._client.aclose()
+
+    async def send_alert(
+        self,
+        *,
+        ticket_id: str,
+        urgency: float,
+        category: str = "General",
+        subject: str = "",
+        description: str = "",
+        customer_id: Optional[str] = None,
+    ) -> bool:
+        """
+        Notify all configured channels about a high-urgency ticket.
+
+        Fields arrive as keyword arguments straight off the consumed
+        message — no intermediate ticket dict is built or probed on
+        either side of the call.
+
+        The sends are independent network round-trips, so they run
+        concurrently — alert latency is the slower channel's RTT, not
+        the sum. Returns True if at least one channel accepted it.
+
+        Below the urgency threshold, or with no webhook configured,
+        this returns before building payloads or scheduling anything —
+        the common low-urgency case costs one compare.
+        """
+        if urgency < settings.HIGH_URGENCY_THRESHOLD:
+            return False
+        if not self.slack_url and not self.discord_url:
+            return False
+        # Shared prep, done once per alert rather than per channel:
+        # subject/description only copy when they actually exceed the
+        # bound (slicing an in-bounds str still allocates), and one
+        # clock read feeds every payload.
+        if len(subject) > _SUBJECT_LIMIT:
+            subject = subject[:_SUBJECT_LIMIT]
+        if len(description) > _DESCRIPTION_LIMIT:
+            description = description[:_DESCRIPTION_LIMIT]
+        emoji, color = _severity(urgency)
+        at = datetime.now().isoformat()
+        tasks = []
+        if self.slack_url:
+            tasks.append(
+                self._send_slack(
+                    ticket_id, subject, category, urgency, description,
+                    customer_id, emoji, at,
+                )
+            )
+        if self.discord_url:
+            tasks.append(
+                self._send_discord(
+                    ticket_id, subject, category, urgency, description,
+                    color, at,
+                )
+            )
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return any(r is True for r in results)
+
+    async def _send_slack(
+        self, ticket_id: str, subject: str, category: str, urgency: float,
+        description: str, customer_id: Optional[str], emoji: str, at: str,
+    ) -> bool:
+        payload = _build_slack_payload(
+            ticket_id, subject, category, urgency, description,
+            customer_id, emoji, at,
+        )
+        return await self._post_with_retry(self.slack_url, payload, _SLACK_SEM, "Slack")
+
+    async def _send_discord(
+        self, ticket_id: str, subject: str, category: str, urgency: float,
+        description: str, color: int, at: str,
+    ) -> bool:
+        payload = _build_discord_payload(
+            ticket_id, subject, category, urgency, description, color, at
+        )
+        return await self._post_with_retry(
+            self.discord_url, payload, _DISCORD_SEM, "Discord"
+        )
+
+    async def _post_with_retry(
+        self, url: str, payload: bytes, sem: asyncio.Semaphore, label: str
+    ) -> bool:
+        """
+        POST with up to _MAX_ATTEMPTS tries: transient transport errors
+        and 5xx responses back off exponentially (with jitter, so a
+        burst of alerts doesn't retry in lockstep); 4xx responses are
+        permanent and fail immediately. The semaphore caps concurrent
+        connections per channel.
+        """
+        async with sem:
+            for attempt in range(_MAX_ATTEMPTS):
+                try:
+                    response = await self._client.post(
+                        url, content=payload, headers=_JSON_HEADERS
+                    )
+                    if response.status_code < 500:
+                        if response.status_code >= 400:
+                            logger.warning(
+                                "%s webhook returned %d", label, response.status_code
+                            )
+                            return False
+                        return True
+                    logger.warning(
+                        "%s webhook returned %d, retrying", label, response.status_code
+                    )
+                except httpx.HTTPError as e:
+                    if attempt == _MAX_ATTEMPTS - 1:
+                        logger.error("%s webhook failed: %s", label, e)
+                if attempt < _MAX_ATTEMPTS - 1:
+                    await asyncio.sleep(0.1 * 2 ** attempt + random.random() * 0.05)
+            return False
+
+
+# Global notifier instance
+webhook_notifier = WebhookNotifier()
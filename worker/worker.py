@@ -0,0 +1,182 @@
+"""
+Background Ticket Worker (Milestone 2)
+Consumes tickets from the Redis queue and handles post-routing work:
+high-urgency webhook alerts and completion bookkeeping.
+
+Run alongside the API: python -m worker.worker
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from broker.async_broker import async_broker, TicketMessage
+from log_utils import make_queue_logger
+from worker.webhooks import webhook_notifier
+from config import settings
+
+# Worker logging runs on the event loop, so it goes through the shared
+# queue-backed logger — stdout flushes never stall processing.
+logger = make_queue_logger(__name__)
+
+
+# Simple processing counters, printed as tickets flow through
+stats = {
+    "processed": 0,
+    "alerts_sent": 0,
+    "failed": 0,
+}
+
+BATCH_MAX = 32        # tickets drained from Redis per wakeup
+MAX_IN_FLIGHT = 64    # concurrently processing tickets on the loop
+STATS_INTERVAL = 10.0  # seconds between stats log lines
+
+# In-flight alert tasks: webhook RTT stays off the per-ticket critical
+# path, and the set keeps strong references until each send finishes.
+_PENDING: set = set()
+
+
+def _reap_alert(task: "asyncio.Task") -> None:
+    _PENDING.discard(task)
+    if not task.cancelled() and task.exception() is None and task.result():
+        stats["alerts_sent"] += 1
+
+
+# The broker client is synchronous (blocking socket reads, BRPOP waits
+# up to its timeout); its calls run on this small thread pool so the
+# event loop — and every in-flight webhook — keeps moving meanwhile.
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="broker")
+
+
+class _Processed(NamedTuple):
+    """Per-ticket processing outcome (no dict allocation per ticket)."""
+    ticket_id: str
+    category: str
+    urgency: float
+    alerted: str
+
+
+async def process_ticket(message: TicketMessage) -> _Processed:
+    """
+    Handle one consumed ticket: alert on high urgency, then mark it
+    complete in the broker.
+    """
+    alerted = "no"
+    loop = asyncio.get_running_loop()
+    try:
+        if message.urgency >= settings.HIGH_URGENCY_THRESHOLD:
+            # Fire and forget: completion in Redis shouldn't wait on a
+            # Slack/Discord round-trip. _reap_alert counts deliveries.
+            task = asyncio.create_task(
+                webhook_notifier.send_alert(
+                    ticket_id=message.ticket_id,
+                    subject=message.subject,
+                    description=message.description,
+                    category=message.category,
+                    urgency=message.urgency,
+                    customer_id=message.metadata.get("customer_id"),
+                )
+            )
+            _PENDING.add(task)
+            task.add_done_callback(_reap_alert)
+            alerted = "pending"
+
+        await loop.run_in_executor(
+            _EXECUTOR, async_broker.complete_ticket, message.ticket_id
+        )
+        stats["processed"] += 1
+    except Exception as e:
+        logger.error("Failed to process %s: %s", message.ticket_id, e)
+        await loop.run_in_executor(
+            _EXECUTOR, async_broker.fail_ticket, message.ticket_id, str(e)
+        )
+        stats["failed"] += 1
+
+    return _Processed(message.ticket_id, message.category, message.urgency, alerted)
+
+
+async def main() -> None:
+    """Consume tickets until interrupted."""
+    if not async_broker.is_connected():
+        if not async_broker.connect():
+            logger.error("Worker cannot start without Redis — exiting.")
+            return
+
+    logger.info("Worker started, waiting for tickets...")
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(MAX_IN_FLIGHT)
+    tasks: set = set()
+
+    async def process_bounded(message: TicketMessage) -> _Processed:
+        async with sem:
+            return await process_ticket(message)
+
+    last_stats = 0.0
+
+    def reap(done: set) -> None:
+        nonlocal last_stats
+        for task in done:
+            result = task.result()
+            logger.info(
+                "Processed %s (category=%s, urgency=%.2f, alerted=%s)",
+                result.ticket_id, result.category,
+                result.urgency, result.alerted,
+            )
+        # Throttled by wall time, not by reap count: idle polls and
+        # dense batches alike produce at most one stats line per
+        # interval, and the counters aren't even read when the level
+        # is off.
+        if logger.isEnabledFor(logging.INFO):
+            now = time.monotonic()
+            if now - last_stats >= STATS_INTERVAL:
+                last_stats = now
+                logger.info(
+                    "stats: processed=%d alerts=%d failed=%d",
+                    stats["processed"], stats["alerts_sent"], stats["failed"],
+                )
+
+    try:
+        while True:
+            # One blocking pop, then drain up to BATCH_MAX non-blocking:
+            # a burst of tickets becomes one batch of concurrent tasks
+            # instead of a serial consume/process/consume cycle.
+            message: Optional[TicketMessage] = await loop.run_in_executor(
+                _EXECUTOR, async_broker.consume_ticket, 1
+            )
+            if message is None:
+                if tasks:
+                    done, tasks = await asyncio.wait(tasks, timeout=0)
+                    reap(done)
+                continue
+            batch = [message]
+            while len(batch) < BATCH_MAX:
+                extra = await loop.run_in_executor(
+                    _EXECUTOR, async_broker.consume_ticket_nowait
+                )
+                if extra is None:
+                    break
+                batch.append(extra)
+            for msg in batch:
+                tasks.add(asyncio.create_task(process_bounded(msg)))
+            # Yield until at least one finishes so the task set (and the
+            # in-flight semaphore queue) stays bounded.
+            while len(tasks) >= MAX_IN_FLIGHT:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                reap(done)
+    except KeyboardInterrupt:
+        logger.info("Worker stopping...")
+    finally:
+        if tasks:
+            done, _ = await asyncio.wait(tasks)
+            reap(done)
+        if _PENDING:
+            await asyncio.gather(*_PENDING, return_exceptions=True)
+        await webhook_notifier.aclose()
+        async_broker.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())